@@ -0,0 +1,150 @@
+"""
+Benchmark of the generic loop over all steps versus the compiled steps of Transformer.
+
+Run with: python -m bench.CompileStepsBenchmark
+"""
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+from bench.NullReader import NullReader
+from bench.NullWriter import NullWriter
+from etlt.Transformer import Transformer
+
+
+class BenchmarkTransformer(Transformer):
+    """
+    Transformer with 10 trivial steps.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, count: int):
+        row = {'field{0:d}'.format(i): 'value {0:d}'.format(i) for i in range(10)}
+        Transformer.__init__(self, NullReader(row, count), NullWriter(''), NullWriter(''), NullWriter(''))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step00(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step01(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field0'] = in_row['field0']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step02(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field1'] = in_row['field1']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step03(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field2'] = in_row['field2']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step04(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field3'] = in_row['field3']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step05(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field4'] = in_row['field4']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step06(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field5'] = in_row['field5']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step07(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field6'] = in_row['field6']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step08(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field7'] = in_row['field7']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step09(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field8'] = in_row['field8']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step10(self, in_row, tmp_row, out_row) -> Tuple[Optional[str], Optional[str]]:
+        out_row['field9'] = in_row['field9']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_ignored_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_parked_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_transformed_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _log_statistics(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_input_fields(self) -> List[str]:
+        return ['field{0:d}'.format(i) for i in range(10)]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_mandatory_fields(self) -> List[str]:
+        return ['field{0:d}'.format(i) for i in range(10)]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_output_fields(self) -> List[str]:
+        return ['field{0:d}'.format(i) for i in range(10)]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def benchmark(compile_steps: bool, count: int) -> float:
+    """
+    Returns the number of rows transformed per second.
+
+    :param compile_steps: Whether to compile the steps.
+    :param count: The number of rows.
+    """
+    transformer = BenchmarkTransformer(count)
+    transformer.compile_steps = compile_steps
+    start = time.perf_counter()
+    transformer.transform_source_rows()
+
+    return count / (time.perf_counter() - start)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    rows = 50000
+    repetitions = 21
+    generic = []
+    compiled = []
+    for _ in range(repetitions):
+        # Alternate both variants such that drift of the machine affects both variants alike.
+        generic.append(benchmark(False, rows))
+        compiled.append(benchmark(True, rows))
+    generic = statistics.median(generic)
+    compiled = statistics.median(compiled)
+    print('Generic loop  : {0:10.0f} rows/s (median of {1:d} runs)'.format(generic, repetitions))
+    print('Compiled steps: {0:10.0f} rows/s (median of {1:d} runs)'.format(compiled, repetitions))
+    print('Gain          : {0:10.1f} %'.format(100.0 * (compiled - generic) / generic))
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,64 @@
+"""
+Benchmark of reading an uncompressed CSV file with UniversalCsvReader through the text I/O layer versus through a memory
+map.
+
+Run with: python -m bench.MemoryMapBenchmark [size in MiB]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from etlt.reader.UniversalCsvReader import UniversalCsvReader
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def create_file(filename: str, size: int) -> None:
+    """
+    Creates a CSV file of approximately a given size.
+
+    :param filename: The name of the file.
+    :param size: The size of the file in bytes.
+    """
+    block = ''.join('{0:d};"name {0:d}";2024-01-{1:02d};{2:.2f};some text with é\r\n'.
+                    format(i, i % 28 + 1, i / 7) for i in range(10000)).encode('utf-8')
+    with open(filename, 'wb') as file:
+        for _ in range(max(1, size // len(block))):
+            file.write(block)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def benchmark(filename: str, memory_map: bool) -> float:
+    """
+    Returns the number of seconds for reading all rows of a file.
+
+    :param filename: The name of the file.
+    :param memory_map: Whether to read the file through a memory map.
+    """
+    reader = UniversalCsvReader([filename])
+    reader.memory_map = memory_map
+
+    start = time.perf_counter()
+    with reader:
+        for _ in reader.next():
+            pass
+
+    return time.perf_counter() - start
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    size = int(sys.argv[1]) * 1024 * 1024 if len(sys.argv) > 1 else 256 * 1024 * 1024
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'bench.csv')
+        create_file(filename, size)
+        mib = os.path.getsize(filename) / 1024 / 1024
+
+        benchmark(filename, False)  # Warm up the page cache.
+        for memory_map in (False, True):
+            elapsed = benchmark(filename, memory_map)
+            print('memory_map={0!s:5}: {1:8.0f} MiB in {2:6.2f} s, {3:8.1f} MiB/s'.
+                  format(memory_map, mib, elapsed, mib / elapsed))
+
+# ----------------------------------------------------------------------------------------------------------------------
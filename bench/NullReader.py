@@ -0,0 +1,37 @@
+from typing import Any, Dict
+
+from etlt.reader.Reader import Reader
+
+
+class NullReader(Reader):
+    """
+    Reader yielding the same row over and over again. The row is not copied, the transformer copies the source rows
+    before modifying them.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, row: Dict[str, Any], count: int):
+        Reader.__init__(self)
+
+        self._row: Dict[str, Any] = row
+        self._count: int = count
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __enter__(self):
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __exit__(self, *_):
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_source_name(self) -> str:
+        return 'null'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def next(self):
+        row = self._row
+        for self._row_number in range(self._count):
+            yield row
+
+# ----------------------------------------------------------------------------------------------------------------------
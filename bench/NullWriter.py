@@ -0,0 +1,27 @@
+from typing import Any, Dict, Optional
+
+from etlt.writer.SqlLoaderWriter import SqlLoaderWriter
+
+
+class NullWriter(SqlLoaderWriter):
+    """
+    Writer discarding all rows.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __enter__(self):
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __exit__(self, *_):
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerow(self, row: Dict[str, Any]) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_bulk_load_sql(self, table_name: str, partition: Optional[str] = None) -> str:
+        return ''
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,59 @@
+"""
+Benchmark of reading a few columns of a wide CSV file with UniversalCsvReader with and without pushing the mapping down
+to splitting lines.
+
+Run with: python -m bench.ProjectionBenchmark
+"""
+import os
+import tempfile
+import time
+from typing import Optional
+
+from etlt.reader.UniversalCsvReader import UniversalCsvReader
+
+
+class FullRowsCsvReader(UniversalCsvReader):
+    """
+    Reader parsing all columns of all lines.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_projection(self) -> Optional[int]:
+        return None
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def benchmark(filename: str, projection: bool) -> float:
+    """
+    Returns the number of rows read per second.
+
+    :param filename: The name of the CSV file.
+    :param projection: Whether to push the mapping down to splitting lines.
+    """
+    reader = UniversalCsvReader([filename]) if projection else FullRowsCsvReader([filename])
+    reader.mapping = {'column{0:d}'.format(i): i for i in range(0, 40, 2)}
+
+    start = time.perf_counter()
+    count = 0
+    with reader:
+        for _ in reader.next():
+            count += 1
+
+    return count / (time.perf_counter() - start)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'wide.csv')
+        with open(filename, 'wt', encoding='utf-8') as file:
+            for i in range(20000):
+                if i % 20 == 0:
+                    file.write(','.join('"value {0:d}"'.format(j) for j in range(300)) + '\n')
+                else:
+                    file.write(','.join('value {0:d}'.format(j) for j in range(300)) + '\n')
+
+        print('all columns: {0:10.0f} rows/s'.format(benchmark(filename, False)))
+        print('projection : {0:10.0f} rows/s'.format(benchmark(filename, True)))
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,71 @@
+"""
+Benchmark of writing rows with SqlLoaderWriter field by field and with a compiled row serializer.
+
+Run with: python -m bench.RowSerializerBenchmark
+"""
+import datetime
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from etlt.writer.SqlLoaderWriter import SqlLoaderWriter
+
+
+class TsvWriter(SqlLoaderWriter):
+    """
+    Writer for writing rows as tab separated values.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerow(self, row: Dict[str, Any]) -> None:
+        self._write_row(row, '\t', '\n')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_bulk_load_sql(self, table_name: str, partition: Optional[str] = None) -> str:
+        return ''
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def benchmark(filename: str, rows: List[Dict[str, Any]], learn_rows: int) -> float:
+    """
+    Returns the number of rows written per second.
+
+    :param filename: The name of the destination file.
+    :param rows: The rows.
+    :param learn_rows: The number of rows before compiling the row serializer.
+    """
+    writer = TsvWriter(filename)
+    writer.fields = list(rows[0])
+    writer.learn_rows = learn_rows
+
+    start = time.perf_counter()
+    with writer:
+        writer.writerows(rows)
+
+    return len(rows) / (time.perf_counter() - start)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    SqlLoaderWriter.register_handler(str, lambda value, file: file.write(value))
+    SqlLoaderWriter.register_handler(int, lambda value, file: file.write(str(value)))
+    SqlLoaderWriter.register_handler(datetime.date, lambda value, file: file.write(value.isoformat()))
+    SqlLoaderWriter.register_handler(type(None), lambda value, file: file.write('\\N'))
+
+    rows = []
+    for i in range(50000):
+        row = {}
+        for j in range(10):
+            row['key{0:d}'.format(j)] = i * j if i % 50 else None
+            row['name{0:d}'.format(j)] = 'name {0:d}'.format(j)
+            row['date{0:d}'.format(j)] = datetime.date(2024, 1, 1 + j)
+        rows.append(row)
+
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, 'rows.tsv')
+        print('field by field: {0:10.0f} rows/s'.format(benchmark(filename, rows, sys.maxsize)))
+        print('serializer    : {0:10.0f} rows/s'.format(benchmark(filename, rows, 100)))
+
+# ----------------------------------------------------------------------------------------------------------------------
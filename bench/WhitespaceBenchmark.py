@@ -0,0 +1,99 @@
+"""
+Benchmark of pruning whitespace of wide rows with WhitespaceCleaner.clean versus Transformer._step00.
+
+Run with: python -m bench.WhitespaceBenchmark
+"""
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from bench.NullReader import NullReader
+from bench.NullWriter import NullWriter
+from etlt.cleaner.WhitespaceCleaner import WhitespaceCleaner
+from etlt.Transformer import Transformer
+
+
+class BenchmarkTransformer(Transformer):
+    """
+    Transformer for pruning whitespace only.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, fields: List[str], whitespace_fields: Optional[List[str]]):
+        self.__fields: List[str] = fields
+        self.__whitespace_fields: Optional[List[str]] = whitespace_fields
+        Transformer.__init__(self, NullReader({}, 0), NullWriter(''), NullWriter(''), NullWriter(''))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_ignored_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_parked_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_transformed_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_input_fields(self) -> List[str]:
+        return self.__fields
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_whitespace_fields(self) -> Optional[List[str]]:
+        return self.__whitespace_fields
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_mandatory_fields(self) -> List[str]:
+        return []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_output_fields(self) -> List[str]:
+        return []
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def clean_step(in_row: Dict[str, Any], tmp_row: Dict[str, Any], out_row: Dict[str, Any]) -> None:
+    """
+    The implementation of _step00 using WhitespaceCleaner.clean.
+    """
+    for key, value in in_row.items():
+        in_row[key] = WhitespaceCleaner.clean(value)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+def benchmark(step: Callable, rows: List[Dict[str, Any]]) -> float:
+    """
+    Returns the number of rows cleaned per second.
+
+    :param step: The step for pruning whitespace.
+    :param rows: The rows.
+    """
+    start = time.perf_counter()
+    for row in rows:
+        step(dict(row), {}, {})
+
+    return len(rows) / (time.perf_counter() - start)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+if __name__ == '__main__':
+    fields = ['field{0:d}'.format(i) for i in range(250)]
+    row = {}
+    for i, field in enumerate(fields):
+        if i % 10 == 0:
+            row[field] = ' dirty  value {0:d} '.format(i)
+        elif i % 10 == 1:
+            row[field] = ''
+        else:
+            row[field] = 'clean value {0:d}'.format(i)
+    rows = [row] * 20000
+
+    all_fields = BenchmarkTransformer(fields, None)
+    some_fields = BenchmarkTransformer(fields, fields[:25])
+
+    print('WhitespaceCleaner.clean, all fields: {0:10.0f} rows/s'.format(benchmark(clean_step, rows)))
+    print('_step00, all fields                : {0:10.0f} rows/s'.format(benchmark(all_fields._step00, rows)))
+    print('_step00, 25 fields (collapse)      : {0:10.0f} rows/s'.format(benchmark(some_fields._step00, rows)))
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,241 @@
+import abc
+import asyncio
+import collections
+import contextlib
+import inspect
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from etlt.helper.MeteredQueue import MeteredQueue
+from etlt.reader.Reader import Reader
+from etlt.Transformer import Transformer
+from etlt.writer.SqlLoaderWriter import SqlLoaderWriter
+
+
+class AsyncTransformer(Transformer, metaclass=abc.ABCMeta):
+    """
+    Abstract parent class for transforming source data in (partial) dimensional data with steps that can await, e.g.
+    lookups in an AsyncRegularDimension or AsyncType2ReferenceDimension. A _step<n> method can be a coroutine function.
+    Chunks of source rows (see chunk_size) are read by a reader thread, the source rows are transformed concurrently in
+    an event loop, and the results are written in the original order of the source rows by a writer thread. Each
+    transformer uses its own threads only, hence, any number of transformers can run concurrently in one event loop.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self,
+                 source_reader: Reader,
+                 transformed_writer: SqlLoaderWriter,
+                 parked_writer: SqlLoaderWriter,
+                 ignored_writer: SqlLoaderWriter):
+        """
+        Object constructor.
+
+        :param source_reader: The source reader.
+        :param transformed_writer: The writer for the transformed rows.
+        :param parked_writer: The writer for the parked rows.
+        :param ignored_writer: The writer for the ignored rows.
+        """
+        Transformer.__init__(self, source_reader, transformed_writer, parked_writer, ignored_writer)
+
+        self.concurrency: int = 100
+        """
+        The maximum number of source rows being transformed concurrently. Use the concurrency of the dimensions for
+        limiting the number of concurrent calls of their stored procedures.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def transform_source_rows_async(self) -> None:
+        """
+        Transforms the rows for the source system into (partial) dimensional data with the steps running in the running
+        event loop. Opening and closing files, reading, writing, and loading is done in threads of this transformer such
+        that the running event loop is not blocked.
+        """
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(1, 'etlt-async') as executor:
+            await loop.run_in_executor(executor, self._start_transform)
+            try:
+                stack = contextlib.ExitStack()
+                try:
+                    await loop.run_in_executor(executor, self._enter_files, stack)
+                    self._prepare_transform_rows()
+                    await self._transform_rows_async()
+                except BaseException:
+                    await loop.run_in_executor(executor, stack.__exit__, *sys.exc_info())
+                    raise
+                await loop.run_in_executor(executor, stack.close)
+            except Exception:
+                await loop.run_in_executor(executor, self._abort_transform)
+                raise
+
+            await loop.run_in_executor(executor, self._finish_transform)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _enter_files(self, stack: contextlib.ExitStack) -> None:
+        """
+        Enters the source reader and the writers on an exit stack.
+
+        :param stack: The exit stack.
+        """
+        stack.enter_context(self._source_reader)
+        stack.enter_context(self._transformed_writer)
+        stack.enter_context(self._parked_writer)
+        stack.enter_context(self._ignored_writer)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _transform_rows(self) -> None:
+        """
+        Transforms all source rows.
+        """
+        self._prepare_transform_rows()
+        asyncio.run(self._transform_rows_async())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _prepare_transform_rows(self) -> None:
+        """
+        Finds the steps and prepares the handover of checkpoints before transforming the source rows.
+        """
+        self._find_all_step_methods()
+        if self._has_batch_steps:
+            raise ValueError('An AsyncTransformer does not support _batch_step<n> methods.')
+
+        if self._loader is not None and self._source_reader.get_checkpoint() is not None:
+            self._chunk_checkpoints = collections.deque()
+        else:
+            self._chunk_checkpoints = None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _transform_rows_async(self) -> None:
+        """
+        Transforms all source rows in a pipeline like _transform_rows_pipelined: a reader thread reads chunks of source
+        rows, the rows are transformed concurrently in the event loop with at most concurrency rows at a time, and a
+        writer thread writes the results in the original order of the source rows. The queues are handed over in a
+        thread of this transformer, not in the default executor of the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        self._read_queue = MeteredQueue(self.pipeline_queue_size)
+        self._write_queue = MeteredQueue(self.pipeline_queue_size)
+        self._pipeline_exception = None
+        stop = threading.Event()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        reader = threading.Thread(target=self._read_pipelined, args=(stop,), name='etlt-reader', daemon=True)
+        writer = threading.Thread(target=self._write_pipelined, name='etlt-writer', daemon=True)
+        reader.start()
+        writer.start()
+        pending = collections.deque()
+        with ThreadPoolExecutor(1, 'etlt-handover') as executor:
+            try:
+                in_flight = 0
+                while self._pipeline_exception is None:
+                    chunk = await loop.run_in_executor(executor, self._read_queue.get_metered)
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, BaseException):
+                        raise chunk
+
+                    tasks = [loop.create_task(self._transform_row_wrapper_async(row_number, row, semaphore))
+                             for row_number, row in chunk]
+                    pending.append((chunk, tasks))
+                    in_flight += len(chunk)
+
+                    # Write the oldest chunk as soon as enough younger rows are in flight to keep the semaphore busy.
+                    while in_flight - len(pending[0][0]) >= self.concurrency:
+                        in_flight -= len(pending[0][0])
+                        await self._write_chunk_async(*pending.popleft(), stop, executor)
+
+                while pending and self._pipeline_exception is None:
+                    await self._write_chunk_async(*pending.popleft(), stop, executor)
+            finally:
+                for _, tasks in pending:
+                    for task in tasks:
+                        task.cancel()
+                stop.set()
+                await loop.run_in_executor(executor, self._write_queue.put, None)
+                await loop.run_in_executor(executor, writer.join)
+                await loop.run_in_executor(executor, reader.join)
+
+        if self._pipeline_exception is not None:
+            raise self._pipeline_exception
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _write_chunk_async(self,
+                                 chunk: List[Tuple[int, Dict[str, Any]]],
+                                 tasks: List[asyncio.Task],
+                                 stop: threading.Event,
+                                 executor: ThreadPoolExecutor) -> None:
+        """
+        Waits for the transformation of a chunk of source rows and hands the results over to the writer thread.
+
+        :param chunk: The row numbers and source rows.
+        :param tasks: The tasks transforming the source rows.
+        :param stop: Event for stopping the pipeline.
+        :param executor: The executor for handing over the results.
+        """
+        results = await asyncio.gather(*tasks)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(executor, self._write_queue.put_metered, (chunk, results), stop)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _transform_row_wrapper_async(self,
+                                           row_number: int,
+                                           row: Dict[str, Any],
+                                           semaphore: asyncio.Semaphore) -> Tuple:
+        """
+        Transforms a single source row. Returns a tuple with the park info, ignore info, and output row.
+
+        :param row_number: The row number of the source row.
+        :param row: The source row.
+        :param semaphore: The semaphore for limiting the number of rows transformed concurrently.
+        """
+        async with semaphore:
+            try:
+                # Transform the naturals keys in line to technical keys.
+                in_row = Transformer._copy_row(row)
+                out_row = {}
+                park_info, ignore_info = await self._transform_row_async(in_row, out_row)
+
+                return park_info, ignore_info, out_row
+
+            except Exception as e:
+                # Log the exception.
+                self._row_number = row_number
+                self._handle_exception(Transformer._original_row(row), e)
+                self._count_error += 1
+
+                return 'Exception', None, {}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _transform_row_async(self, in_row: Dict[str, Any], out_row: Dict[str, Any]) -> \
+            Tuple[Optional[str], Optional[str]]:
+        """
+        Transforms an input row to an output row (i.e. (partial) dimensional data). Awaits the steps that are
+        coroutine functions.
+
+        :param in_row: The input row.
+        :param out_row: The output row.
+        """
+        tmp_row = {}
+        profiles = self._step_profiles if self.profile_steps else None
+
+        for step in self._steps:
+            start = time.perf_counter()
+            try:
+                result = step(in_row, tmp_row, out_row)
+                if inspect.isawaitable(result):
+                    result = await result
+                park_info, ignore_info = result
+            except Exception:
+                if profiles is not None:
+                    Transformer._record_step(profiles[step.__name__], time.perf_counter() - start, 'Exception', None)
+                raise
+            if profiles is not None:
+                Transformer._record_step(profiles[step.__name__], time.perf_counter() - start, park_info, ignore_info)
+            if park_info or ignore_info:
+                return park_info, ignore_info
+
+        return None, None
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -1,12 +1,24 @@
 import abc
+import collections
 import copy
+import inspect
+import logging
+import multiprocessing
+import queue
 import re
+import sys
+import threading
 import time
 import traceback
+import types
+import weakref
 from pprint import pformat
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, MutableMapping, Optional, Tuple
 
 from etlt.cleaner.WhitespaceCleaner import WhitespaceCleaner
+from etlt.helper.CopyOnWriteRow import CopyOnWriteRow
+from etlt.helper.MeteredQueue import MeteredQueue
+from etlt.metrics.MetricsSink import MetricsSink
 from etlt.reader.Reader import Reader
 from etlt.writer.SqlLoaderWriter import SqlLoaderWriter
 
@@ -15,6 +27,21 @@ class Transformer(metaclass=abc.ABCMeta):
     """
     Abstract parent class for transforming source data in (partial) dimensional data.
     """
+    _step_names: MutableMapping[type, List[str]] = weakref.WeakKeyDictionary()
+    """
+    The names of the _step<n> and _batch_step<n> methods per class.
+    """
+
+    _compiled_steps: MutableMapping[type, Dict[Tuple[Tuple[str, ...], Tuple[str, ...]], callable]] = \
+        weakref.WeakKeyDictionary()
+    """
+    The compiled steps per class, mandatory fields, and names of the steps set on the instance.
+    """
+
+    _worker: Optional['Transformer'] = None
+    """
+    In a worker process: the transformer for transforming chunks of source rows.
+    """
 
     # ------------------------------------------------------------------------------------------------------------------
     def __init__(self,
@@ -101,9 +128,183 @@ class Transformer(metaclass=abc.ABCMeta):
         The mandatory fields (columns) in the output row.
         """
 
+        self._whitespace_fields: Optional[List[str]] = None
+        """
+        The fields (columns) in the input row of which whitespace must be pruned. None for all fields.
+        """
+
         self._steps: List[callable] = []
         """
-        All _step<n> methods where n is an integer in this class sorted by n.
+        All _step<n> and _batch_step<n> methods where n is an integer in this class sorted by n.
+        """
+
+        self._has_batch_steps: bool = False
+        """
+        Whether this class has any _batch_step<n> method.
+        """
+
+        self._row_transformer: callable = self._transform_row
+        """
+        The function for transforming an input row to an output row.
+        """
+
+        self._row_number: int = -1
+        """
+        The row number of the source row currently being transformed.
+        """
+
+        self.workers: int = 0
+        """
+        The number of worker processes for transforming source rows in parallel. If less than 2 all source rows are
+        transformed in the current process.
+
+        The steps, _handle_exception, and the lookups in dimensions run in the (forked) worker processes, hence, each
+        worker process has its own copy of this transformer and its side effects are lost: attributes set by the steps
+        or _handle_exception are not visible in the current process, each worker process has its own cache of each
+        dimension, and database connections of this transformer and its dimensions are inherited, i.e. shared, by all
+        worker processes. Only the results of the rows, the error counts and error groups, and the step profiles are
+        returned to the current process. Hence, use workers only with steps without side effects and with dimensions
+        that open their own database connection in each worker process (or have preloaded all their data). Requires the
+        fork start method of multiprocessing, i.e. not available on Windows.
+        """
+
+        self.load_rows: int = 0
+        """
+        If greater than 0, the transformed rows are loaded into the database while transforming rows in files of at
+        most this number of rows. Requires _load_transformed_file to be implemented.
+        """
+
+        self.load_bytes: int = 0
+        """
+        If greater than 0, the transformed rows are loaded into the database while transforming rows in files of
+        (approximately) at most this number of bytes. Requires _load_transformed_file to be implemented.
+
+        If the source reader supports checkpoints, the files with parked and ignored rows are loaded together with each
+        file with transformed rows (requires _load_parked_file and _load_ignored_file to be implemented) and the
+        checkpoint of the source reader is saved with _save_checkpoint after the files have been loaded. When
+        transforming chunks of source rows (see workers, pipeline, and _batch_step<n>) files are handed over at chunk
+        boundaries only, hence, a file can hold up to chunk_size - 1 rows more than load_rows.
+        """
+
+        self._loader: Optional[threading.Thread] = None
+        """
+        The background thread for loading transformed rows while transforming rows.
+        """
+
+        self._loader_queue: Optional[queue.Queue] = None
+        """
+        The queue with the names of the files with transformed rows to be loaded by the background thread.
+        """
+
+        self._loader_exception: Optional[Exception] = None
+        """
+        The exception raised by the background thread for loading transformed rows.
+        """
+
+        self._loader_rows: int = 0
+        """
+        The number of rows written to the current file with transformed rows.
+        """
+
+        self._chunk_checkpoints: Optional[collections.deque] = None
+        """
+        When transforming chunks of source rows while loading transformed rows and the source reader supports
+        checkpoints: the checkpoints of the source reader after each chunk not yet written.
+        """
+
+        self.profile_steps: bool = False
+        """
+        If True, the number of calls, the total and maximum time spent, and the number of rows parked and ignored are
+        recorded for each step. Not applicable when this class overrides _transform_row.
+        """
+
+        self._step_profiles: Dict[str, List] = {}
+        """
+        The profile of each step: the number of calls, the total time, the maximum time, the number of rows parked,
+        and the number of rows ignored.
+        """
+
+        self._park_reasons: Dict[str, int] = {}
+        """
+        The number of rows parked per park info.
+        """
+
+        self._ignore_reasons: Dict[str, int] = {}
+        """
+        The number of rows ignored per ignore info.
+        """
+
+        self.error_detail_limit: int = 10
+        """
+        The maximum number of errors per exception type and origin logged in full detail. Further errors are counted
+        only. In the parallel mode this limit applies per worker process.
+        """
+
+        self._error_groups: Dict[str, int] = {}
+        """
+        The number of errors per exception type and origin.
+        """
+
+        self._error_groups_popped: Dict[str, int] = {}
+        """
+        In a worker process: the number of errors per exception type and origin already passed to the main process.
+        """
+
+        self.metrics_sink: Optional[MetricsSink] = None
+        """
+        If set, the sink to which metrics are pushed while transforming rows and after loading all rows.
+        """
+
+        self.metrics_interval: float = 60.0
+        """
+        The minimum number of seconds between pushing metrics to the metrics sink while transforming rows.
+        """
+
+        self._metrics_row: int = sys.maxsize
+        """
+        The number of processed rows at which to check whether metrics must be pushed to the metrics sink.
+        """
+
+        self._metrics_time: float = 0.0
+        """
+        The time metrics have been pushed to the metrics sink most recently.
+        """
+
+        self.compile_steps: bool = False
+        """
+        If True, the _step<n> methods are compiled into a single function for transforming an input row to an output
+        row. Not applicable when this class has _batch_step<n> methods or overrides _transform_row.
+        """
+
+        self.chunk_size: int = 1000
+        """
+        The number of source rows transformed at once by _batch_step<n> methods or sent at once to a worker process.
+        """
+
+        self.pipeline: bool = False
+        """
+        If True, chunks of source rows are read by a reader thread, transformed by the current thread, and written by a
+        writer thread. The stages are connected by bounded queues. Not applicable when workers is 2 or more.
+        """
+
+        self.pipeline_queue_size: int = 8
+        """
+        The maximum number of chunks in each queue between the stages of the pipeline.
+        """
+
+        self._read_queue: Optional[MeteredQueue] = None
+        """
+        The queue between the reader thread and the transform stage of the pipeline.
+        """
+
+        self._write_queue: Optional[MeteredQueue] = None
+        """
+        The queue between the transform stage and the writer thread of the pipeline.
+        """
+
+        self._pipeline_exception: Optional[BaseException] = None
+        """
+        The exception raised by the writer thread of the pipeline.
         """
 
         self.__init_fields()
@@ -112,37 +313,134 @@ class Transformer(metaclass=abc.ABCMeta):
     @staticmethod
     def _log(message: str) -> None:
         """
-        Logs a message.
+        Logs a message with the etlt logger. If logging has not been configured, i.e. no handlers are found for the
+        etlt logger, the message is printed on stdout with a timestamp.
 
         :param message: The log message.
         """
-        #  @todo Replace with log package.
-        print(time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()) + ' ' + str(message), flush=True)
+        Transformer._log_with_level(logging.INFO, message)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _log_error(self, message: str) -> None:
+        """
+        Logs an error message with the etlt logger (or on stdout, see _log). If _log has been overridden by a child
+        class, the message is logged with _log instead.
+
+        :param message: The log message.
+        """
+        if type(self)._log is Transformer._log:
+            Transformer._log_with_level(logging.ERROR, message)
+        else:
+            self._log(message)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _log_with_level(level: int, message: str) -> None:
+        """
+        Logs a message with the etlt logger if logging has been configured. Otherwise, prints the message on stdout.
+
+        :param level: The level of the log message.
+        :param message: The log message.
+        """
+        logger = logging.getLogger('etlt')
+        if logger.hasHandlers():
+            logger.log(level, str(message))
+        else:
+            print(time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()) + ' ' + str(message), flush=True)
 
     # ------------------------------------------------------------------------------------------------------------------
     def _handle_exception(self, row: Dict[str, Any], exception: Exception) -> None:
         """
-        Logs an exception occurred during transformation of a row.
+        Logs an exception occurred during transformation of a row. Exceptions are grouped by exception type and origin,
+        only the first error_detail_limit errors of each group are logged in full detail.
 
         :param row: The source row.
         :param exception: The exception.
         """
-        self._log('Error during processing of line {0:d}.'.format(self._source_reader.row_number))
-        self._log(pformat(row))
-        self._log(str(exception))
-        self._log(traceback.format_exc())
+        group = Transformer._error_group(exception)
+        count = self._error_groups.get(group, 0) + 1
+        self._error_groups[group] = count
+
+        if count <= self.error_detail_limit:
+            self._log_error('Error during processing of line {0:d}.'.format(self._row_number))
+            self._log_error(pformat(row))
+            self._log_error(str(exception))
+            self._log_error(traceback.format_exc())
+            if count == self.error_detail_limit:
+                self._log_error('Further errors of {0} are counted only.'.format(group))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _error_group(exception: Exception) -> str:
+        """
+        Returns the group of an exception, i.e. the exception type and the file and line where the exception has been
+        raised.
+
+        :param exception: The exception.
+        """
+        tb = exception.__traceback__
+        if tb is None:
+            return type(exception).__name__
+
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+
+        return '{0} at {1}:{2:d}'.format(type(exception).__name__, tb.tb_frame.f_code.co_filename, tb.tb_lineno)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @classmethod
+    def _get_step_names(cls) -> List[str]:
+        """
+        Returns the names of all _step<n> and _batch_step<n> methods where n is an integer in this class sorted by n.
+
+        The names are discovered only once per class.
+        """
+        names = Transformer._step_names.get(cls)
+        if names is None:
+            steps = []
+            for method in dir(cls):
+                match = re.match(r'(_step|_batch_step)(\d+\d+.*)', method)
+                if match and callable(getattr(cls, method)):
+                    steps.append((match.group(2), method))
+            names = [step for _, step in sorted(steps)]
+            Transformer._step_names[cls] = names
+
+        return names
 
     # ------------------------------------------------------------------------------------------------------------------
     def _find_all_step_methods(self) -> None:
         """
-        Finds all _step<n> methods where n is an integer in this class.
+        Finds all _step<n> and _batch_step<n> methods where n is an integer in this class.
+
+        A _step<n> method transforms a single row and is called with the input row, a temporary row, and the output row.
+        A _batch_step<n> method transforms a block of rows and is called with a list of tuples of the input row,
+        temporary row, and output row, and must return a list with a tuple of the park info and ignore info for each
+        row. Both kinds of steps are called in the order of n.
         """
-        steps = (
-                [method for method in dir(self) if
-                 callable(getattr(self, method)) and re.match(r'_step\d+\d+.*', method)])
-        steps = sorted(steps)
-        for step in steps:
-            self._steps.append(getattr(self, step))
+        self._steps = [getattr(self, name) for name in self._get_step_names()]
+        self._has_batch_steps = any(Transformer._is_batch_step(step) for step in self._steps)
+
+        generic = type(self)._transform_row is Transformer._transform_row
+        if self.profile_steps:
+            for step in self._steps:
+                self._step_profiles.setdefault(step.__name__, [0, 0.0, 0.0, 0, 0])
+
+        if self.profile_steps and generic:
+            self._row_transformer = self._transform_row_profiled
+        elif self.compile_steps and not self._has_batch_steps and generic:
+            self._row_transformer = types.MethodType(self._compile_steps(), self)
+        else:
+            self._row_transformer = self._transform_row
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _is_batch_step(step: callable) -> bool:
+        """
+        Returns whether a step is a _batch_step<n> method.
+
+        :param step: The step.
+        """
+        return step.__name__.startswith('_batch_step')
 
     # ------------------------------------------------------------------------------------------------------------------
     def _transform_rows(self) -> None:
@@ -151,8 +449,348 @@ class Transformer(metaclass=abc.ABCMeta):
         """
         self._find_all_step_methods()
 
+        if (self.workers > 1 or self.pipeline or self._has_batch_steps) and self._loader is not None and \
+                self._source_reader.get_checkpoint() is not None:
+            self._chunk_checkpoints = collections.deque()
+        else:
+            self._chunk_checkpoints = None
+
+        self._read_queue = None
+        self._write_queue = None
+
+        if self.workers > 1:
+            self._transform_rows_parallel()
+        elif self.pipeline:
+            self._transform_rows_pipelined()
+        elif self._has_batch_steps:
+            for chunk in self._read_chunks():
+                self._write_chunk(chunk, self._transform_chunk(chunk, True))
+        else:
+            for row in self._source_reader.next():
+                self._transform_row_wrapper(row)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _read_chunks(self):
+        """
+        Yields lists of tuples with the row number and the source row of at most chunk_size source rows.
+        """
+        chunk = []
         for row in self._source_reader.next():
-            self._transform_row_wrapper(row)
+            chunk.append((self._source_reader.row_number, row))
+            if len(chunk) >= self.chunk_size:
+                if self._chunk_checkpoints is not None:
+                    self._chunk_checkpoints.append(self._source_reader.get_checkpoint())
+                yield chunk
+                chunk = []
+
+        if chunk:
+            if self._chunk_checkpoints is not None:
+                self._chunk_checkpoints.append(self._source_reader.get_checkpoint())
+            yield chunk
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _transform_rows_pipelined(self) -> None:
+        """
+        Transforms all source rows in a pipeline of three stages connected by bounded queues: a reader thread reads
+        chunks of source rows, the current thread transforms the chunks, and a writer thread writes the results in the
+        original order of the source rows.
+        """
+        self._read_queue = MeteredQueue(self.pipeline_queue_size)
+        self._write_queue = MeteredQueue(self.pipeline_queue_size)
+        self._pipeline_exception = None
+        stop = threading.Event()
+
+        reader = threading.Thread(target=self._read_pipelined, args=(stop,), name='etlt-reader', daemon=True)
+        writer = threading.Thread(target=self._write_pipelined, name='etlt-writer', daemon=True)
+        reader.start()
+        writer.start()
+        try:
+            while self._pipeline_exception is None:
+                chunk = self._read_queue.get_metered()
+                if chunk is None:
+                    break
+                if isinstance(chunk, BaseException):
+                    raise chunk
+
+                self._write_queue.put_metered((chunk, self._transform_chunk(chunk, True)), stop)
+        finally:
+            stop.set()
+            self._write_queue.put(None)
+            writer.join()
+            reader.join()
+
+        if self._pipeline_exception is not None:
+            raise self._pipeline_exception
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _read_pipelined(self, stop: threading.Event) -> None:
+        """
+        In the reader thread of the pipeline: reads chunks of source rows and puts them, followed by None, on the read
+        queue. In case of an exception the exception is put on the read queue.
+
+        :param stop: Event for stopping reading.
+        """
+        try:
+            for chunk in self._read_chunks():
+                if not self._read_queue.put_metered(chunk, stop):
+                    return
+
+            self._read_queue.put_metered(None, stop)
+        except BaseException as e:
+            self._read_queue.put_metered(e, stop)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _write_pipelined(self) -> None:
+        """
+        In the writer thread of the pipeline: writes the results of transformed chunks from the write queue until None.
+        After an exception the remaining results are discarded.
+        """
+        while True:
+            item = self._write_queue.get_metered()
+            if item is None:
+                break
+
+            if self._pipeline_exception is None:
+                try:
+                    chunk, results = item
+                    self._write_chunk(chunk, results, False)
+                except BaseException as e:
+                    self._pipeline_exception = e
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _transform_rows_parallel(self) -> None:
+        """
+        Transforms all source rows in parallel using a pool of worker processes.
+
+        Chunks of source rows are transformed by the worker processes, the results are written by the current process
+        in the original order of the source rows. The worker processes are forked such that this transformer (with its
+        open reader, writers, and database connections) does not need to be pickled.
+        """
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError('Transforming rows with {0:d} workers requires the fork start method, which is not '
+                               'available on this platform. Set workers to 0.'.format(self.workers))
+
+        context = multiprocessing.get_context('fork')
+        with context.Pool(self.workers, Transformer._init_worker, (self,)) as pool:
+            pending = collections.deque()
+            for chunk in self._read_chunks():
+                pending.append((chunk, pool.apply_async(Transformer._transform_chunk_in_worker, (chunk,))))
+                if len(pending) >= 2 * self.workers:
+                    self._write_worker_chunk(*pending.popleft())
+
+            while pending:
+                self._write_worker_chunk(*pending.popleft())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _init_worker(transformer: 'Transformer') -> None:
+        """
+        Initializes a worker process.
+
+        :param transformer: The transformer for transforming chunks of source rows.
+        """
+        Transformer._worker = transformer
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _transform_chunk_in_worker(chunk: List[Tuple[int, Dict[str, Any]]]) -> Tuple[List[Tuple], Dict[str, Any]]:
+        """
+        Transforms a chunk of source rows in a worker process. Returns the results of the transformed chunk and the
+        statistics of the worker process gathered while transforming the chunk.
+
+        :param chunk: The row numbers and source rows.
+        """
+        # The source rows are private copies of the worker process, hence, it is safe to modify the rows.
+        results = Transformer._worker._transform_chunk(chunk, False)
+
+        return results, Transformer._worker._pop_worker_statistics()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _pop_worker_statistics(self) -> Dict[str, Any]:
+        """
+        Returns and resets the statistics gathered by this transformer in a worker process.
+        """
+        statistics = {'count_error':   self._count_error,
+                      'error_groups':  {group: count - self._error_groups_popped.get(group, 0)
+                                        for group, count in self._error_groups.items()},
+                      'step_profiles': {name: list(profile) for name, profile in self._step_profiles.items()}}
+        self._count_error = 0
+        self._error_groups_popped = dict(self._error_groups)
+        for profile in self._step_profiles.values():
+            profile[:] = [0, 0.0, 0.0, 0, 0]
+
+        return statistics
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _merge_worker_statistics(self, statistics: Dict[str, Any]) -> None:
+        """
+        Merges statistics gathered by a worker process into the statistics of this transformer.
+
+        :param statistics: The statistics as returned by _pop_worker_statistics.
+        """
+        self._count_error += statistics['count_error']
+        for group, count in statistics['error_groups'].items():
+            self._error_groups[group] = self._error_groups.get(group, 0) + count
+        for name, (calls, duration, max_duration, parks, ignores) in statistics['step_profiles'].items():
+            profile = self._step_profiles.setdefault(name, [0, 0.0, 0.0, 0, 0])
+            profile[0] += calls
+            profile[1] += duration
+            profile[2] = max(profile[2], max_duration)
+            profile[3] += parks
+            profile[4] += ignores
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _transform_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]], copy_rows: bool) -> List[Tuple]:
+        """
+        Transforms a chunk of source rows. Returns a list with the park info, ignore info, and output row of each
+        source row.
+
+        :param chunk: The row numbers and source rows.
+        :param copy_rows: If True, the steps are called with copies of the source rows.
+        """
+        if self._has_batch_steps:
+            return self._transform_chunk_by_step(chunk, copy_rows)
+
+        results = []
+        for self._row_number, row in chunk:
+            try:
+                in_row = Transformer._copy_row(row) if copy_rows else row
+                out_row = {}
+                park_info, ignore_info = self._row_transformer(in_row, out_row)
+
+            except Exception as e:
+                # Log the exception.
+                self._handle_exception(Transformer._original_row(row), e)
+                self._count_error += 1
+                park_info = 'Exception'
+                ignore_info = None
+                out_row = {}
+
+            results.append((park_info, ignore_info, out_row))
+
+        return results
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _transform_chunk_by_step(self, chunk: List[Tuple[int, Dict[str, Any]]], copy_rows: bool) -> List[Tuple]:
+        """
+        Transforms a chunk of source rows step by step, i.e. each step is applied to all rows in the chunk before the
+        next step is applied. Rows parked or ignored by a step are not passed to the next steps.
+
+        :param chunk: The row numbers and source rows.
+        :param copy_rows: If True, the steps are called with copies of the source rows.
+        """
+        rows = [(Transformer._copy_row(row) if copy_rows else row, {}, {}) for _, row in chunk]
+        results = [(None, None, out_row) for _, _, out_row in rows]
+        active = list(range(len(rows)))
+
+        for step in self._steps:
+            if not active:
+                break
+
+            profile = self._step_profiles[step.__name__] if self.profile_steps else None
+            remaining = []
+            if Transformer._is_batch_step(step):
+                start = time.perf_counter()
+                try:
+                    infos = step([rows[index] for index in active])
+                    if len(infos) != len(active):
+                        raise ValueError('{0} returned {1:d} results for {2:d} rows.'.format(step.__name__,
+                                                                                             len(infos),
+                                                                                             len(active)))
+                except Exception as e:
+                    if profile is not None:
+                        Transformer._record_step(profile, time.perf_counter() - start, None, None)
+                        profile[3] += len(active)
+                    infos = None
+                    for index in active:
+                        self._row_number, row = chunk[index]
+                        self._handle_exception(Transformer._original_row(row), e)
+                        self._count_error += 1
+                        results[index] = ('Exception', None, {})
+
+                if infos is not None:
+                    if profile is not None:
+                        Transformer._record_step(profile, time.perf_counter() - start, None, None)
+                    for index, (park_info, ignore_info) in zip(active, infos):
+                        if park_info or ignore_info:
+                            results[index] = (park_info, ignore_info, rows[index][2])
+                            if profile is not None:
+                                profile[3 if park_info else 4] += 1
+                        else:
+                            remaining.append(index)
+            else:
+                for index in active:
+                    start = time.perf_counter()
+                    try:
+                        park_info, ignore_info = step(*rows[index])
+                    except Exception as e:
+                        if profile is not None:
+                            Transformer._record_step(profile, time.perf_counter() - start, 'Exception', None)
+                        self._row_number, row = chunk[index]
+                        self._handle_exception(Transformer._original_row(row), e)
+                        self._count_error += 1
+                        results[index] = ('Exception', None, {})
+                        continue
+
+                    if profile is not None:
+                        Transformer._record_step(profile, time.perf_counter() - start, park_info, ignore_info)
+                    if park_info or ignore_info:
+                        results[index] = (park_info, ignore_info, rows[index][2])
+                    else:
+                        remaining.append(index)
+
+            active = remaining
+
+        return results
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _write_worker_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]], result) -> None:
+        """
+        Writes the results of a chunk of source rows transformed by a worker process.
+
+        :param chunk: The row numbers and source rows.
+        :param multiprocessing.pool.AsyncResult result: The pending results of the worker process.
+        """
+        results, statistics = result.get()
+        self._merge_worker_statistics(statistics)
+        self._write_chunk(chunk, results)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _write_chunk(self,
+                     chunk: List[Tuple[int, Dict[str, Any]]],
+                     results: List[Tuple],
+                     track_row_number: bool = True) -> None:
+        """
+        Writes the results of a transformed chunk of source rows.
+
+        :param chunk: The row numbers and source rows.
+        :param results: The results of the transformed chunk as returned by _transform_chunk.
+        :param track_row_number: If True, the row number is set to the row number of the row being written. False when
+                                 writing in the writer thread of the pipeline.
+        """
+        transformed = []
+        for (row_number, row), (park_info, ignore_info, out_row) in zip(chunk, results):
+            if track_row_number:
+                self._row_number = row_number
+            if park_info or ignore_info:
+                self._count_total += 1
+                self._write_row(row, park_info, ignore_info, out_row)
+            else:
+                transformed.append(out_row)
+
+        # Write the technical keys and measures of all transformed rows of the chunk to the output file at once.
+        self._transformed_writer.writerows(transformed)
+        self._count_total += len(transformed)
+        self._count_transform += len(transformed)
+        if self._loader is not None:
+            self._loader_rows += len(transformed)
+            if self._chunk_checkpoints is not None:
+                self._rotate_transformed_writer(True, self._chunk_checkpoints.popleft())
+            else:
+                self._rotate_transformed_writer(True)
+
+        if self._count_total >= self._metrics_row:
+            self._push_metrics(False)
 
     # ------------------------------------------------------------------------------------------------------------------
     def pre_park_row(self, park_info: str, in_row: Dict[str, Any]) -> None:
@@ -174,6 +812,27 @@ class Transformer(metaclass=abc.ABCMeta):
         """
         pass
 
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _copy_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns a copy of a source row that can be modified by the steps. A CopyOnWriteRow is not copied since it keeps
+        track of its original values itself.
+
+        :param row: The source row.
+        """
+        return row if isinstance(row, CopyOnWriteRow) else copy.copy(row)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _original_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns the original of a source row.
+
+        :param row: The source row (possibly modified by the steps if a CopyOnWriteRow).
+        """
+        return row.original() if isinstance(row, CopyOnWriteRow) else row
+
     # ------------------------------------------------------------------------------------------------------------------
     def _transform_row_wrapper(self, row: Dict[str, Any]) -> None:
         """
@@ -181,37 +840,65 @@ class Transformer(metaclass=abc.ABCMeta):
 
         :param row: The source row.
         """
+        self._row_number = self._source_reader.row_number
         self._count_total += 1
 
         try:
             # Transform the naturals keys in line to technical keys.
-            in_row = copy.copy(row)
+            in_row = Transformer._copy_row(row)
             out_row = {}
-            park_info, ignore_info = self._transform_row(in_row, out_row)
+            park_info, ignore_info = self._row_transformer(in_row, out_row)
 
         except Exception as e:
             # Log the exception.
-            self._handle_exception(row, e)
+            self._handle_exception(Transformer._original_row(row), e)
             self._count_error += 1
             park_info = 'Exception'
             # Keep our IDE happy.
             ignore_info = None
             out_row = {}
 
+        self._write_row(row, park_info, ignore_info, out_row)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _write_row(self,
+                   row: Dict[str, Any],
+                   park_info: Optional[str],
+                   ignore_info: Optional[str],
+                   out_row: Dict[str, Any]) -> None:
+        """
+        Writes a source row to the parked or ignored writer or the output row to the transformed writer.
+
+        :param row: The source row.
+        :param park_info: The park info.
+        :param ignore_info: The ignore info.
+        :param out_row: The output row.
+        """
         if park_info:
             # Park the row.
+            row = Transformer._original_row(row)
             self.pre_park_row(park_info, row)
             self._parked_writer.writerow(row)
             self._count_park += 1
+            self._park_reasons[park_info] = self._park_reasons.get(park_info, 0) + 1
         elif ignore_info:
             # Ignore the row.
+            row = Transformer._original_row(row)
             self.pre_ignore_row(ignore_info, row)
             self._ignored_writer.writerow(row)
             self._count_ignore += 1
+            self._ignore_reasons[ignore_info] = self._ignore_reasons.get(ignore_info, 0) + 1
         else:
             # Write the technical keys and measures to the output file.
             self._transformed_writer.writerow(out_row)
             self._count_transform += 1
+            if self._loader is not None:
+                self._loader_rows += 1
+                if self._chunk_checkpoints is None:
+                    self._rotate_transformed_writer(self._loader_rows % 1000 == 0)
+
+        if self._count_total >= self._metrics_row:
+            self._push_metrics(False)
 
     # ------------------------------------------------------------------------------------------------------------------
     def _transform_row(self, in_row: Dict[str, Any], out_row: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
@@ -230,18 +917,117 @@ class Transformer(metaclass=abc.ABCMeta):
 
         return None, None
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def _transform_row_profiled(self, in_row: Dict[str, Any], out_row: Dict[str, Any]) -> \
+            Tuple[Optional[str], Optional[str]]:
+        """
+        Transforms an input row to an output row (i.e. (partial) dimensional data) and records the profile of each
+        step.
+
+        :param in_row: The input row.
+        :param out_row: The output row.
+        """
+        tmp_row = {}
+        profiles = self._step_profiles
+
+        for step in self._steps:
+            start = time.perf_counter()
+            try:
+                park_info, ignore_info = step(in_row, tmp_row, out_row)
+            except Exception:
+                Transformer._record_step(profiles[step.__name__], time.perf_counter() - start, 'Exception', None)
+                raise
+            Transformer._record_step(profiles[step.__name__], time.perf_counter() - start, park_info, ignore_info)
+            if park_info or ignore_info:
+                return park_info, ignore_info
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _record_step(profile: List, duration: float, park_info: Optional[str], ignore_info: Optional[str]) -> None:
+        """
+        Records a call of a step in the profile of the step.
+
+        :param profile: The profile of the step.
+        :param duration: The duration of the call in seconds.
+        :param park_info: The park info returned by the step.
+        :param ignore_info: The ignore info returned by the step.
+        """
+        profile[0] += 1
+        profile[1] += duration
+        if duration > profile[2]:
+            profile[2] = duration
+        if park_info:
+            profile[3] += 1
+        elif ignore_info:
+            profile[4] += 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _compile_steps(self) -> callable:
+        """
+        Returns a function equivalent to _transform_row with all steps called inline. The validation of the mandatory
+        fields by _step99 is inlined as well, unless _step99 has been overridden. Steps set on this transformer
+        instance (i.e. overriding the step of the class) are called through the instance.
+
+        The function is generated only once per class, mandatory fields, and steps set on the instance.
+        """
+        cls = type(self)
+        functions = Transformer._compiled_steps.setdefault(cls, {})
+        mandatory_fields = tuple(self.__mandatory_fields)
+        instance_steps = tuple(name for name in self._get_step_names() if name in self.__dict__)
+        key = (mandatory_fields, instance_steps)
+        if key in functions:
+            return functions[key]
+
+        namespace = {}
+        lines = ['def _transform_row(self, in_row, out_row):',
+                 '    tmp_row = {}']
+        for index, name in enumerate(self._get_step_names()):
+            if name == '_step99' and cls._step99 is Transformer._step99 and name not in instance_steps:
+                if mandatory_fields:
+                    condition = ' or '.join('not out_row.get({0!r})'.format(field) for field in mandatory_fields)
+                    lines.append('    if {0}:'.format(condition))
+                    lines.append('        return self._step99(in_row, tmp_row, out_row)')
+            else:
+                step = inspect.getattr_static(cls, name)
+                if isinstance(step, types.FunctionType) and name not in instance_steps:
+                    namespace['step{0:d}'.format(index)] = step
+                    lines.append('    info = step{0:d}(self, in_row, tmp_row, out_row)'.format(index))
+                else:
+                    lines.append('    info = self.{0}(in_row, tmp_row, out_row)'.format(name))
+                lines.append('    if info[0] or info[1]:')
+                lines.append('        return info')
+        lines.append('    return None, None')
+
+        exec('\n'.join(lines), namespace)
+        functions[key] = namespace['_transform_row']
+
+        return functions[key]
+
     # ------------------------------------------------------------------------------------------------------------------
     def _step00(self, in_row: Dict[str, Any], tmp_row: Dict[str, Any], out_row: Dict[str, Any]) -> Tuple[
         Optional[str], Optional[str]]:
         """
-        Prunes whitespace for all fields in the input row.
+        Prunes whitespace of the fields in the input row as returned by _get_whitespace_fields.
 
         :param in_row: The input row.
         :param tmp_row: Not used.
         :param out_row: Not used.
         """
-        for key, value in in_row.items():
-            in_row[key] = WhitespaceCleaner.clean(value)
+        if self._whitespace_fields is None:
+            clean = WhitespaceCleaner.clean
+            for key, value in in_row.items():
+                cleaned = clean(value)
+                if cleaned is not value:
+                    in_row[key] = cleaned
+        else:
+            collapse = WhitespaceCleaner.collapse
+            for key in self._whitespace_fields:
+                value = in_row.get(key)
+                cleaned = collapse(value)
+                if cleaned is not value:
+                    in_row[key] = cleaned
 
         return None, None
 
@@ -288,14 +1074,275 @@ class Transformer(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_transformed_file(self, filename: str) -> None:
+        """
+        Loads a file with successfully transformed rows into the database.
+
+        Must be overridden when transformed rows are loaded while transforming rows (see load_rows and load_bytes). This
+        method is called from a background thread, hence, it must use its own database connection.
+
+        :param filename: The name of the file with transformed rows.
+        """
+        raise NotImplementedError()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_parked_file(self, filename: str) -> None:
+        """
+        Loads a file with parked rows into the database.
+
+        Must be overridden when transformed rows are loaded while transforming rows (see load_rows and load_bytes) and
+        the source reader supports checkpoints. This method is called from a background thread, hence, it must use its
+        own database connection.
+
+        :param filename: The name of the file with parked rows.
+        """
+        raise NotImplementedError()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_ignored_file(self, filename: str) -> None:
+        """
+        Loads a file with ignored rows into the database.
+
+        Must be overridden when transformed rows are loaded while transforming rows (see load_rows and load_bytes) and
+        the source reader supports checkpoints. This method is called from a background thread, hence, it must use its
+        own database connection.
+
+        :param filename: The name of the file with ignored rows.
+        """
+        raise NotImplementedError()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        """
+        Saves a checkpoint of the source reader. All transformed, parked, and ignored rows read before the checkpoint
+        have been loaded into the database.
+
+        This method is called only when transformed rows are loaded while transforming rows (see load_rows and
+        load_bytes) and the source reader supports checkpoints. Then, the files with parked and ignored rows are rotated
+        together with the file with transformed rows and are loaded with _load_parked_file and _load_ignored_file before
+        the checkpoint is saved. The last checkpoint is saved after _load_ignored_rows and _load_parked_rows have loaded
+        the remaining parked and ignored rows. This method is called from a background thread, except for the last
+        checkpoint. Override this method for persisting the checkpoint such that a failed run can be resumed from the
+        checkpoint (see UniversalCsvReader.resume).
+
+        :param checkpoint: The checkpoint of the source reader.
+        """
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _start_loader(self) -> None:
+        """
+        Starts the background thread for loading transformed rows while transforming rows.
+        """
+        self._loader_queue = queue.Queue()
+        self._loader_exception = None
+        self._loader_rows = 0
+        self._loader = threading.Thread(target=self._load_transformed_files, daemon=True)
+        self._loader.start()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _stop_loader(self, load_last_file: bool) -> None:
+        """
+        Stops the background thread for loading transformed rows after all files handed over have been loaded.
+
+        :param load_last_file: If True, the last file with transformed rows is loaded as well and any exception raised
+                               by the background thread is reraised.
+        """
+        if load_last_file:
+            filename = self._transformed_writer.filename if self._loader_rows > 0 else None
+            self._loader_queue.put((filename, None, None, None))
+        self._loader_queue.put(None)
+        self._loader.join()
+        self._loader = None
+
+        if load_last_file and self._loader_exception is not None:
+            raise self._loader_exception
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_transformed_files(self) -> None:
+        """
+        Loads the files with transformed rows, and parked and ignored rows if any, handed over by the transformer until
+        the transformer is done and saves the checkpoint of the source reader after each file.
+        """
+        while True:
+            item = self._loader_queue.get()
+            if item is None:
+                break
+
+            if self._loader_exception is None:
+                filename, parked_filename, ignored_filename, checkpoint = item
+                try:
+                    if filename is not None:
+                        self._load_transformed_file(filename)
+                    if parked_filename is not None:
+                        self._load_parked_file(parked_filename)
+                    if ignored_filename is not None:
+                        self._load_ignored_file(ignored_filename)
+                    if checkpoint is not None:
+                        self._save_checkpoint(checkpoint)
+                except Exception as e:
+                    self._loader_exception = e
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _rotate_transformed_writer(self, check_bytes: bool, checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Hands the current file with transformed rows, together with the checkpoint of the source reader, to the
+        background thread when the file has reached its maximum size. If the source reader supports checkpoints, the
+        current files with parked and ignored rows are handed over as well.
+
+        :param check_bytes: Whether to check the size in bytes of the current file.
+        :param checkpoint: The checkpoint of the source reader after the last row written. If None, the current
+                           checkpoint of the source reader.
+        """
+        if (0 < self.load_rows <= self._loader_rows) or \
+                (self.load_bytes > 0 and check_bytes and self._transformed_writer.tell() >= self.load_bytes):
+            if self._loader_exception is not None:
+                raise self._loader_exception
+
+            if checkpoint is None:
+                checkpoint = self._source_reader.get_checkpoint()
+            if checkpoint is not None:
+                parked_filename = self._parked_writer.rotate() if self._parked_writer.tell() > 0 else None
+                ignored_filename = self._ignored_writer.rotate() if self._ignored_writer.tell() > 0 else None
+            else:
+                parked_filename = None
+                ignored_filename = None
+            self._loader_queue.put((self._transformed_writer.rotate(), parked_filename, ignored_filename, checkpoint))
+            self._loader_rows = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _rate(count: int, duration: float) -> float:
+        """
+        Returns the number of rows per second.
+
+        :param count: The number of rows.
+        :param duration: The duration in seconds.
+        """
+        return count / duration if duration > 0.0 else 0.0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the metrics of this transformer. This method can be called from another thread while
+        transforming rows. The snapshot has the following keys:
+        - source: The name of the current source.
+        - row_number: The row number of the source row currently being transformed.
+        - count_total, count_transform, count_park, count_ignore, count_error: The counters of rows.
+        - elapsed: The number of seconds elapsed since the start of the whole process.
+        - rows_per_second: The number of rows per second processed.
+        - park_reasons, ignore_reasons: The number of rows parked and ignored per park and ignore info.
+        - error_groups: The number of errors per exception type and origin.
+        - step_profiles: The profile of each step as returned by get_step_profiles (only when profile_steps is set).
+        - pipeline: The statistics of the pipeline as returned by get_pipeline_statistics (only when pipeline is set).
+        """
+        now = time.perf_counter()
+        time1 = self._time1 if self._time1 else now
+
+        return {'source':          self._source_reader.get_source_name(),
+                'row_number':      self._row_number,
+                'count_total':     self._count_total,
+                'count_transform': self._count_transform,
+                'count_park':      self._count_park,
+                'count_ignore':    self._count_ignore,
+                'count_error':     self._count_error,
+                'elapsed':         (self._time3 if self._time3 else now) - self._time0,
+                'rows_per_second': self._rate(self._count_total, time1 - self._time0),
+                'park_reasons':    dict(self._park_reasons),
+                'ignore_reasons':  dict(self._ignore_reasons),
+                'error_groups':    dict(self._error_groups),
+                'step_profiles':   self.get_step_profiles(),
+                'pipeline':        self.get_pipeline_statistics()}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_pipeline_statistics(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the statistics of the pipeline (only when pipeline is set) with the following keys:
+        - read_queue, write_queue: The statistics of the queue between the reader thread and the transform stage and
+          between the transform stage and the writer thread, see MeteredQueue.get_statistics.
+        - stalls: The number of seconds each stage (read, transform, and write) has been blocked by an empty input queue
+          or a full output queue. The stage with the least stall time is the bottleneck.
+        """
+        if self._read_queue is None:
+            return None
+
+        read_queue = self._read_queue.get_statistics()
+        write_queue = self._write_queue.get_statistics()
+
+        return {'read_queue':  read_queue,
+                'write_queue': write_queue,
+                'stalls':      {'read':      read_queue['put_wait'],
+                                'transform': read_queue['get_wait'] + write_queue['put_wait'],
+                                'write':     write_queue['get_wait']}}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_step_profiles(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the profile of each step (only when profile_steps is set). A profile has the following keys:
+        - calls: The number of calls of the step. A _batch_step<n> method is called once per chunk.
+        - time: The total number of seconds spent in the step.
+        - max_time: The maximum number of seconds spent in a single call of the step.
+        - parks, ignores: The number of rows parked (including rows failing with an exception) and ignored by the step.
+        """
+        return {name: {'calls':    calls,
+                       'time':     duration,
+                       'max_time': max_duration,
+                       'parks':    parks,
+                       'ignores':  ignores}
+                for name, (calls, duration, max_duration, parks, ignores) in list(self._step_profiles.items())}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _log_step_profiles(self) -> None:
+        """
+        Logs the profile of each step.
+        """
+        profiles = self.get_step_profiles()
+        if not profiles:
+            return
+
+        width = max(len(name) for name in profiles)
+        self._log('{0:<{1}} {2:>10} {3:>12} {4:>12} {5:>12} {6:>10} {7:>10}'.format('Step',
+                                                                                    width,
+                                                                                    'Calls',
+                                                                                    'Total (s)',
+                                                                                    'Mean (ms)',
+                                                                                    'Max (ms)',
+                                                                                    'Parked',
+                                                                                    'Ignored'))
+        for name, profile in sorted(profiles.items(), key=lambda item: item[1]['time'], reverse=True):
+            mean = 1000.0 * profile['time'] / profile['calls'] if profile['calls'] else 0.0
+            self._log('{0:<{1}} {2:>10d} {3:>12.3f} {4:>12.3f} {5:>12.3f} {6:>10d} {7:>10d}'.format(
+                    name,
+                    width,
+                    profile['calls'],
+                    profile['time'],
+                    mean,
+                    1000.0 * profile['max_time'],
+                    profile['parks'],
+                    profile['ignores']))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _push_metrics(self, force: bool) -> None:
+        """
+        Pushes the metrics of this transformer to the metrics sink if the metrics interval has passed.
+
+        :param force: If True, pushes the metrics regardless of the metrics interval.
+        """
+        self._metrics_row = self._count_total + 1000
+        now = time.perf_counter()
+        if force or now - self._metrics_time >= self.metrics_interval:
+            self._metrics_time = now
+            self.metrics_sink.emit(self.get_metrics())
+
     # ------------------------------------------------------------------------------------------------------------------
     def _log_statistics(self) -> None:
         """
         Log statistics about the number of rows and number of rows per second.
         """
-        rows_per_second_trans = self._count_total / (self._time1 - self._time0)
-        rows_per_second_load = self._count_transform / (self._time2 - self._time1)
-        rows_per_second_overall = self._count_total / (self._time3 - self._time0)
+        rows_per_second_trans = self._rate(self._count_total, self._time1 - self._time0)
+        rows_per_second_load = self._rate(self._count_transform, self._time2 - self._time1)
+        rows_per_second_overall = self._rate(self._count_total, self._time3 - self._time0)
 
         self._log('Number of rows processed            : {0:d}'.format(self._count_total))
         self._log('Number of rows transformed          : {0:d}'.format(self._count_transform))
@@ -306,6 +1353,24 @@ class Transformer(metaclass=abc.ABCMeta):
         self._log('Number of rows per second loaded    : {0:d}'.format(int(rows_per_second_load)))
         self._log('Number of rows per second overall   : {0:d}'.format(int(rows_per_second_overall)))
 
+        for group, count in self._error_groups.items():
+            self._log('Number of errors of {0}: {1:d} ({2:d} not logged)'.format(
+                    group,
+                    count,
+                    max(0, count - self.error_detail_limit)))
+
+        if self.profile_steps:
+            self._log_step_profiles()
+
+        statistics = self.get_pipeline_statistics()
+        if statistics is not None:
+            for stage, stall in statistics['stalls'].items():
+                self._log('{0:<36}: {1:.3f}'.format('Seconds stalled in stage ' + stage, stall))
+            for name in ('read_queue', 'write_queue'):
+                self._log('{0:<36}: {1:.1f}/{2:d}'.format('Mean/max depth of ' + name,
+                                                          statistics[name]['mean_depth'],
+                                                          statistics[name]['max_depth']))
+
     # ------------------------------------------------------------------------------------------------------------------
     def pre_transform_source_rows(self) -> None:
         """
@@ -318,23 +1383,64 @@ class Transformer(metaclass=abc.ABCMeta):
         """
         Transforms the rows for the source system into (partial) dimensional data.
         """
+        self._start_transform()
+        try:
+            with self._source_reader:
+                with self._transformed_writer:
+                    with self._parked_writer:
+                        with self._ignored_writer:
+                            self._transform_rows()
+        except Exception:
+            self._abort_transform()
+            raise
+
+        self._finish_transform()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _start_transform(self) -> None:
+        """
+        Starts the timers, invokes pre_transform_source_rows, and starts the loader thread (if any) before the source
+        rows are transformed.
+        """
         # Start timer for overall progress.
         self._time0 = time.perf_counter()
+        self._time1 = 0.0
+        self._time2 = 0.0
+        self._time3 = 0.0
+        if self.metrics_sink is not None:
+            self._metrics_row = 0
+            self._metrics_time = self._time0
 
         self.pre_transform_source_rows()
 
-        # Transform all source rows.
-        with self._source_reader:
-            with self._transformed_writer:
-                with self._parked_writer:
-                    with self._ignored_writer:
-                        self._transform_rows()
+        if self.load_rows > 0 or self.load_bytes > 0:
+            self._start_loader()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _abort_transform(self) -> None:
+        """
+        Stops the loader thread (if any) without loading the remaining transformed rows after transforming the source
+        rows has failed.
+        """
+        if self.load_rows > 0 or self.load_bytes > 0:
+            self._stop_loader(False)
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def _finish_transform(self) -> None:
+        """
+        Loads the transformed, parked, and ignored rows and shows the statistics after all source rows have been
+        transformed.
+        """
         # Time end of transformation.
         self._time1 = time.perf_counter()
 
-        # Load transformed rows into the fact table.
-        self._load_transformed_rows()
+        pipelined = self.load_rows > 0 or self.load_bytes > 0
+        if pipelined:
+            # Load the remaining transformed rows into the fact table.
+            self._stop_loader(True)
+        else:
+            # Load transformed rows into the fact table.
+            self._load_transformed_rows()
 
         # Time end of loading transformed rows.
         self._time2 = time.perf_counter()
@@ -343,9 +1449,19 @@ class Transformer(metaclass=abc.ABCMeta):
         self._load_ignored_rows()
         self._load_parked_rows()
 
+        if pipelined:
+            # All rows have been loaded, save the last checkpoint.
+            checkpoint = self._source_reader.get_checkpoint()
+            if checkpoint is not None:
+                self._save_checkpoint(checkpoint)
+
         # Time end of loading parked and ignored rows.
         self._time3 = time.perf_counter()
 
+        if self.metrics_sink is not None:
+            self._push_metrics(True)
+            self._metrics_row = sys.maxsize
+
         # Show statistics about number of rows and performance.
         self._log_statistics()
 
@@ -357,6 +1473,17 @@ class Transformer(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_whitespace_fields(self) -> Optional[List[str]]:
+        """
+        Returns the fields (columns) in the input row of which whitespace must be pruned by _step00.
+
+        None (default): whitespace of all fields is pruned with WhitespaceCleaner.clean, i.e. double spaces and leading
+        and trailing whitespace only. Otherwise: all runs of whitespace (including newlines, tabs, and non-breaking
+        spaces) of the given fields only are replaced by a single space with WhitespaceCleaner.collapse.
+        """
+        return None
+
     # ------------------------------------------------------------------------------------------------------------------
     @abc.abstractmethod
     def _get_mandatory_fields(self) -> List[str]:
@@ -379,7 +1506,9 @@ class Transformer(metaclass=abc.ABCMeta):
         Initializes the fields of source, output, and mandatory.
         """
         self._source_reader.fields = self._get_input_fields()
+        self._source_reader.copy_on_write = True
         self.__mandatory_fields = self._get_mandatory_fields()
+        self._whitespace_fields = self._get_whitespace_fields()
         self._transformed_writer.fields = self._get_output_fields()
 
     # ----------------------------------------------------------------------------------------------------------------------
@@ -20,4 +20,23 @@ class WhitespaceCleaner:
 
         return string.replace('  ', ' ').strip()
 
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def collapse(string: Optional[str]) -> Optional[str]:
+        """
+        Replaces all runs of whitespace in a string with a single space and removes leading and trailing whitespace. If
+        the string needs no cleaning the string itself is returned.
+
+        :param string: The string.
+        """
+        # Return empty input immediately.
+        if not string:
+            return string
+
+        # Return clean input immediately. Note: whitespace other than space is not printable.
+        if string.isprintable() and '  ' not in string and string.strip() is string:
+            return string
+
+        return ' '.join(string.split())
+
 # ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,147 @@
+import abc
+import asyncio
+from typing import Any, Dict, Optional
+
+
+class AsyncRegularDimension(metaclass=abc.ABCMeta):
+    """
+    Abstract parent class for translating natural key to a technical key of a regular dimension with an asynchronous
+    stored procedure. Concurrent lookups of the same natural key share a single call of the stored procedure.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, concurrency: int = 10):
+        """
+        Object constructor.
+
+        :param concurrency: The maximum number of concurrent calls of the stored procedure.
+        """
+
+        self._map: Dict[Any, Optional[int]] = {}
+        """
+        The map from natural keys to a technical keys.
+        """
+
+        self._pending: Dict[Any, asyncio.Future] = {}
+        """
+        The futures of the technical keys of the natural keys being looked up by the stored procedure.
+        """
+
+        self._concurrency: int = concurrency
+        """
+        The maximum number of concurrent calls of the stored procedure.
+        """
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        """
+        The semaphore for limiting the number of concurrent calls of the stored procedure.
+        """
+
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        """
+        The event loop of the semaphore.
+        """
+
+        self.pre_load_data()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def get_id(self, natural_key: Any, enhancement: Any = None) -> Optional[int]:
+        """
+        Returns the technical ID for a natural key or None if the given natural key is not valid.
+
+        :param natural_key: The natural key.
+        :param enhancement: Enhancement data of the dimension row.
+        """
+        # If the natural key is known return the technical ID immediately.
+        if natural_key in self._map:
+            return self._map[natural_key]
+
+        # If the natural key is being looked up already wait for the result of that lookup.
+        future = self._pending.get(natural_key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        # The natural key is not in the map of this dimension. Call a stored procedure for translating the natural key
+        # to a technical key.
+        future = asyncio.get_running_loop().create_future()
+        self._pending[natural_key] = future
+        try:
+            async with self._get_semaphore():
+                await self.pre_call_stored_procedure()
+                success = False
+                try:
+                    key = await self.call_stored_procedure(natural_key, enhancement)
+                    success = True
+                finally:
+                    await self.post_call_stored_procedure(success)
+
+            # Add the translation for natural key to technical ID to the map.
+            self._map[natural_key] = key
+            future.set_result(key)
+
+            return key
+        except BaseException as exception:
+            if isinstance(exception, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exception)
+                # Mark the exception as retrieved, there might be no other lookups waiting for this lookup.
+                future.exception()
+            raise
+        finally:
+            del self._pending[natural_key]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the semaphore for limiting the number of concurrent calls of the stored procedure in the running event
+        loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+            self._semaphore_loop = loop
+
+        return self._semaphore
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @abc.abstractmethod
+    async def call_stored_procedure(self, natural_key: Any, enhancement: Any) -> Optional[int]:
+        """
+        Calls a stored procedure for getting the technical key of a natural key. Returns the technical ID or None if
+        the given natural key is not valid.
+
+        :param natural_key: The natural key.
+        :param enhancement: Enhancement data of the dimension row.
+        """
+        raise NotImplementedError()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def pre_load_data(self) -> None:
+        """
+        Can be overridden to preload lookup data from a dimension table.
+        """
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def pre_call_stored_procedure(self) -> None:
+        """
+        This method is invoked before call the stored procedure for getting the technical key of a natural key.
+
+        Override this method to acquire a lock on the dimension or dimension hierarchy.
+        """
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def post_call_stored_procedure(self, success: bool) -> None:
+        """
+        This method is invoked after calling the stored procedure for getting the technical key of a natural key.
+
+        Override this method to release a lock on the dimension or dimension hierarchy and to commit or rollback the
+        transaction.
+
+        :param success: True: the stored procedure is executed successfully. False: an exception has occurred.
+        """
+        pass
+
+# ----------------------------------------------------------------------------------------------------------------------
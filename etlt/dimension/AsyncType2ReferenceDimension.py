@@ -0,0 +1,193 @@
+import abc
+import asyncio
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class AsyncType2ReferenceDimension(metaclass=abc.ABCMeta):
+    """
+    Abstract class for type2 dimensions for which the reference data is supplied with date intervals with an
+    asynchronous stored procedure. The stored procedure is called for at most one date of a natural key at a time:
+    concurrent lookups of a natural key wait for the call in flight, which often loads the date interval they need as
+    well, and call the stored procedure themselves only if their date is still missing.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, concurrency: int = 10):
+        """
+        Object constructor.
+
+        :param concurrency: The maximum number of concurrent calls of the stored procedure.
+        """
+
+        self._key_key: str = ''
+        """
+        The key in the dict returned by call_stored_procedure holding the technical ID.
+        """
+
+        self._key_date_start: str = ''
+        """
+        The key in the dict returned by call_stored_procedure holding the start date.
+        """
+
+        self._key_date_end: str = ''
+        """
+        The key in the dict returned by call_stored_procedure holding the end date.
+        """
+
+        self._map: Dict[Any, List[Any]] = {}
+        """
+        The map from natural keys to lists of tuples with start date, end date, and technical keys. The dates must be in
+        ISO 8601 (YYYY-MM-DD) format.
+        """
+
+        self._pending: Dict[Any, asyncio.Future] = {}
+        """
+        The futures that are done when the calls of the stored procedure for the natural keys being looked up are done.
+        """
+
+        self._concurrency: int = concurrency
+        """
+        The maximum number of concurrent calls of the stored procedure.
+        """
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        """
+        The semaphore for limiting the number of concurrent calls of the stored procedure.
+        """
+
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        """
+        The event loop of the semaphore.
+        """
+
+        self.pre_load_data()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def get_id(self, natural_key: Any, date: str, enhancement: Any = None) -> Optional[int]:
+        """
+        Returns the technical ID for a natural key at a date or None if the given natural key is not valid.
+
+        :param natural_key: The natural key.
+        :param date: The date in ISO 8601 (YYYY-MM-DD) format.
+        :param enhancement: Enhancement data of the dimension row.
+        """
+        if not date:
+            return None
+
+        while True:
+            # If the natural key is known return the technical ID immediately.
+            key = self._lookup(natural_key, date)
+            if key is not None:
+                return key[0]
+
+            # If the natural key is being looked up already wait for that lookup and try again.
+            future = self._pending.get(natural_key)
+            if future is None:
+                break
+            await asyncio.wait([future])
+
+        # The natural key is not in the map of this dimension. Call a stored procedure for translating the natural key
+        # to a technical key.
+        future = asyncio.get_running_loop().create_future()
+        self._pending[natural_key] = future
+        try:
+            async with self._get_semaphore():
+                await self.pre_call_stored_procedure()
+                success = False
+                try:
+                    row = await self.call_stored_procedure(natural_key, date, enhancement)
+                    # Convert dates to strings in ISO 8601 format.
+                    if isinstance(row[self._key_date_start], datetime.date):
+                        row[self._key_date_start] = row[self._key_date_start].isoformat()
+                    if isinstance(row[self._key_date_end], datetime.date):
+                        row[self._key_date_end] = row[self._key_date_end].isoformat()
+                    success = True
+                finally:
+                    await self.post_call_stored_procedure(success)
+
+            # Make sure the natural key is in the map.
+            if natural_key not in self._map:
+                self._map[natural_key] = []
+
+            if row[self._key_key]:
+                self._map[natural_key].append((row[self._key_date_start], row[self._key_date_end], row[self._key_key]))
+            else:
+                self._map[natural_key].append((date, date, None))
+
+            return row[self._key_key]
+        finally:
+            del self._pending[natural_key]
+            future.set_result(None)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _lookup(self, natural_key: Any, date: str) -> Optional[Tuple[Optional[int]]]:
+        """
+        Returns a tuple with the technical ID for a natural key at a date if the natural key at the date is in the map
+        of this dimension. Otherwise, returns None.
+
+        :param natural_key: The natural key.
+        :param date: The date in ISO 8601 (YYYY-MM-DD) format.
+        """
+        if natural_key in self._map:
+            for row in self._map[natural_key]:
+                if row[0] <= date <= row[1]:
+                    return row[2],
+
+        return None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Returns the semaphore for limiting the number of concurrent calls of the stored procedure in the running event
+        loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+            self._semaphore_loop = loop
+
+        return self._semaphore
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @abc.abstractmethod
+    async def call_stored_procedure(self, natural_key: Any, date: str, enhancement: Any) -> Dict[str, Any]:
+        """
+        Call a stored procedure for getting the technical key of a natural key at a date. Returns the technical ID or
+        None if the given natural key is not valid.
+
+        :param natural_key: The natural key.
+        :param date: The date in ISO 8601 (YYYY-MM-DD) format.
+        :param enhancement: Enhancement data of the dimension row.
+        """
+        raise NotImplementedError()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def pre_load_data(self) -> None:
+        """
+        Can be overridden to preload lookup data from a dimension table.
+        """
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def pre_call_stored_procedure(self) -> None:
+        """
+        This method is invoked before call the stored procedure for getting the technical key of a natural key.
+
+        Override this method to acquire a lock on the dimension or dimension hierarchy.
+        """
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def post_call_stored_procedure(self, success: bool) -> None:
+        """
+        This method is invoked after calling the stored procedure for getting the technical key of a natural key.
+
+        Override this method to release a lock on the dimension or dimension hierarchy and to commit or rollback the
+        transaction.
+
+        :param success: True: the stored procedure is executed successfully. False: an exception has occurred.
+        """
+        pass
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,104 @@
+from typing import Any, Dict
+
+
+class CopyOnWriteRow(dict):
+    """
+    A row that keeps track of the original values of the fields modified such that the original row can be
+    materialized when required. Reading fields of a row is as fast as reading from an ordinary dictionary.
+    """
+    _missing = object()
+    """
+    Marker for fields not in the original row.
+    """
+
+    _originals = None
+    """
+    The original values of the modified fields.
+
+    :type: dict[str,*]|None
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._save(key)
+        dict.__setitem__(self, key, value)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __delitem__(self, key: str) -> None:
+        self._save(key)
+        dict.__delitem__(self, key)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __ior__(self, other):
+        self.update(other)
+
+        return self
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def clear(self) -> None:
+        for key in self:
+            self._save(key)
+        dict.clear(self)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def pop(self, key: str, *args) -> Any:
+        self._save(key)
+
+        return dict.pop(self, key, *args)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def popitem(self):
+        key, value = dict.popitem(self)
+        self._save(key, value)
+
+        return key, value
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self._save(key)
+
+        return dict.setdefault(self, key, default)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def original(self) -> Dict[str, Any]:
+        """
+        Returns the original row. If no field has been modified the row itself is returned.
+        """
+        if not self._originals:
+            return self
+
+        row = dict(self)
+        for key, value in self._originals.items():
+            if value is CopyOnWriteRow._missing:
+                row.pop(key, None)
+            else:
+                row[key] = value
+
+        return row
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _save(self, key: str, value: Any = _missing) -> None:
+        """
+        Saves the original value of a field if not saved before.
+
+        :param key: The key of the field.
+        :param value: The current value of the field if already removed from this row.
+        """
+        originals = self._originals
+        if originals is None:
+            originals = self._originals = {}
+
+        if key not in originals:
+            originals[key] = dict.get(self, key, CopyOnWriteRow._missing) if value is CopyOnWriteRow._missing else value
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,100 @@
+import queue
+import threading
+import time
+from typing import Any, Dict
+
+
+class MeteredQueue(queue.Queue):
+    """
+    A bounded FIFO queue between two stages of a pipeline that keeps track of its depth and of the time the producer
+    and the consumer have been blocked. Each side of the queue must be used by a single thread.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, maxsize: int):
+        """
+        Object constructor.
+
+        :param maxsize: The maximum number of items in the queue.
+        """
+        queue.Queue.__init__(self, maxsize)
+
+        self.put_wait: float = 0.0
+        """
+        The total number of seconds the producer has been blocked because the queue was full.
+        """
+
+        self.get_wait: float = 0.0
+        """
+        The total number of seconds the consumer has been blocked because the queue was empty.
+        """
+
+        self.puts: int = 0
+        """
+        The number of items put on the queue.
+        """
+
+        self.depth_sum: int = 0
+        """
+        The sum of the depths of the queue just before putting an item on the queue.
+        """
+
+        self.max_depth: int = 0
+        """
+        The maximum depth of the queue just before putting an item on the queue.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def put_metered(self, item: Any, stop: threading.Event) -> bool:
+        """
+        Puts an item on the queue, blocking while the queue is full. Returns False if the stop event has been set
+        while blocking.
+
+        :param item: The item.
+        :param stop: Event for stopping the producer.
+        """
+        depth = self.qsize()
+        self.puts += 1
+        self.depth_sum += depth
+        self.max_depth = max(self.max_depth, depth)
+
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    self.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    if stop.is_set():
+                        return False
+        finally:
+            self.put_wait += time.perf_counter() - start
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_metered(self) -> Any:
+        """
+        Removes and returns an item from the queue, blocking while the queue is empty.
+        """
+        start = time.perf_counter()
+        item = self.get()
+        self.get_wait += time.perf_counter() - start
+
+        return item
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Returns the statistics of this queue with the following keys:
+        - depth: The current depth of the queue.
+        - max_depth: The maximum depth of the queue.
+        - mean_depth: The mean depth of the queue.
+        - put_wait: The total number of seconds the producer has been blocked because the queue was full.
+        - get_wait: The total number of seconds the consumer has been blocked because the queue was empty.
+        """
+        return {'depth':      self.qsize(),
+                'max_depth':  self.max_depth,
+                'mean_depth': self.depth_sum / self.puts if self.puts else 0.0,
+                'put_wait':   self.put_wait,
+                'get_wait':   self.get_wait}
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,65 @@
+import io
+from typing import BinaryIO
+
+
+class ReplayStream(io.RawIOBase):
+    """
+    A raw binary stream that replays bytes already read from a stream before reading the remainder of that stream.
+    Allows sniffing the head of a (compressed) file and parsing the whole file while opening and decompressing the file
+    only once.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, head: bytes, stream: BinaryIO):
+        """
+        Object constructor.
+
+        :param head: The bytes already read from the stream.
+        :param stream: The stream.
+        """
+        io.RawIOBase.__init__(self)
+
+        self._head: memoryview = memoryview(head)
+        """
+        The bytes of the head not yet replayed.
+        """
+
+        self._stream: BinaryIO = stream
+        """
+        The underlying stream.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def readable(self) -> bool:
+        """
+        Returns True, this stream is readable.
+        """
+        return True
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def readinto(self, buffer) -> int:
+        """
+        Reads bytes into a buffer and returns the number of bytes read.
+
+        :param buffer: The buffer.
+        """
+        if self._head:
+            size = min(len(buffer), len(self._head))
+            buffer[:size] = self._head[:size]
+            self._head = self._head[size:]
+
+            return size
+
+        return self._stream.readinto(buffer)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def close(self) -> None:
+        """
+        Closes this stream and the underlying stream.
+        """
+        if not self.closed:
+            self._head.release()
+            self._stream.close()
+        io.RawIOBase.close(self)
+
+# ----------------------------------------------------------------------------------------------------------------------
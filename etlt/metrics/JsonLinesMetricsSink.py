@@ -0,0 +1,40 @@
+import json
+from typing import Any, Dict
+
+from etlt.metrics.MetricsSink import MetricsSink
+
+
+class JsonLinesMetricsSink(MetricsSink):
+    """
+    Sink for appending metrics to a file in JSON lines format.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, filename: str, encoding: str = 'utf8'):
+        """
+        Object constructor.
+
+        :param filename: The name of the file.
+        :param encoding: The encoding of the file.
+        """
+        self._filename: str = filename
+        """
+        The name of the file.
+        """
+
+        self._encoding: str = encoding
+        """
+        The encoding of the file.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def emit(self, metrics: Dict[str, Any]) -> None:
+        """
+        Appends a snapshot of metrics as a single line to the file.
+
+        :param metrics: The metrics as returned by Transformer.get_metrics.
+        """
+        with open(self._filename, mode='at', encoding=self._encoding) as file:
+            file.write(json.dumps(metrics, sort_keys=True) + '\n')
+
+# ----------------------------------------------------------------------------------------------------------------------
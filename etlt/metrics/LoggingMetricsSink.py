@@ -0,0 +1,41 @@
+import json
+import logging
+from typing import Any, Dict, Optional
+
+from etlt.metrics.MetricsSink import MetricsSink
+
+
+class LoggingMetricsSink(MetricsSink):
+    """
+    Sink for logging metrics with the logging package.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        """
+        Object constructor.
+
+        :param logger: The logger. Defaults to the etlt logger.
+        :param level: The level for logging metrics.
+        """
+        self._logger: logging.Logger = logger if logger else logging.getLogger('etlt')
+        """
+        The logger.
+        """
+
+        self._level: int = level
+        """
+        The level for logging metrics.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def emit(self, metrics: Dict[str, Any]) -> None:
+        """
+        Logs a snapshot of metrics as a single JSON document.
+
+        :param metrics: The metrics as returned by Transformer.get_metrics.
+        """
+        if self._logger.isEnabledFor(self._level):
+            self._logger.log(self._level, json.dumps(metrics, sort_keys=True))
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,20 @@
+import abc
+from typing import Any, Dict
+
+
+class MetricsSink(metaclass=abc.ABCMeta):
+    """
+    Abstract parent class for sinks receiving metrics pushed by a transformer.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @abc.abstractmethod
+    def emit(self, metrics: Dict[str, Any]) -> None:
+        """
+        Emits a snapshot of metrics.
+
+        :param metrics: The metrics as returned by Transformer.get_metrics.
+        """
+        raise NotImplementedError()
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,143 @@
+import codecs
+from typing import Optional
+
+import chardet
+
+try:
+    import cchardet
+except ImportError:  # pragma: no cover
+    cchardet = None
+
+try:
+    import charset_normalizer
+except ImportError:  # pragma: no cover
+    charset_normalizer = None
+
+
+class EncodingDetector:
+    """
+    Detects the encoding of a sample of a CSV file. The detection tries, in this order:
+    - a byte order mark;
+    - a strict UTF-8 decode;
+    - a faster detector (cchardet or charset_normalizer), if installed;
+    - chardet.
+
+    Override the methods of this class in your own child class according to your needs.
+    """
+    boms = [(codecs.BOM_UTF8, 'utf-8-sig'),
+            (codecs.BOM_UTF32_LE, 'utf-32'),
+            (codecs.BOM_UTF32_BE, 'utf-32'),
+            (codecs.BOM_UTF16_LE, 'utf-16'),
+            (codecs.BOM_UTF16_BE, 'utf-16')]
+    """
+    The byte order marks and their encodings. Note: UTF-32 must be tested before UTF-16.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, use_fast_detector: bool = True, incremental: bool = False, chunk_size: int = 4096):
+        """
+        Object constructor.
+
+        :param use_fast_detector: Whether to use a faster detector, if installed, before falling back to chardet.
+        :param incremental: If True, chardet is fed with chunks of the sample and stops as soon as it is confident.
+        :param chunk_size: The size of the chunks in incremental mode.
+        """
+        self._use_fast_detector: bool = use_fast_detector
+        """
+        Whether to use a faster detector, if installed, before falling back to chardet.
+        """
+
+        self._incremental: bool = incremental
+        """
+        If True, chardet is fed with chunks of the sample and stops as soon as it is confident.
+        """
+
+        self._chunk_size: int = chunk_size
+        """
+        The size of the chunks in incremental mode.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def detect(self, sample: bytes) -> Optional[str]:
+        """
+        Returns the encoding of a sample. Returns None if the encoding cannot be detected.
+
+        :param sample: The sample, i.e. the head of the file.
+        """
+        encoding = self._detect_bom(sample)
+        if encoding is None:
+            encoding = self._detect_utf8(sample)
+        if encoding is None and self._use_fast_detector:
+            encoding = self._detect_fast(sample)
+        if encoding is None:
+            encoding = self._detect_chardet(sample)
+
+        return encoding
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _detect_bom(self, sample: bytes) -> Optional[str]:
+        """
+        Returns the encoding given by the byte order mark of a sample, if any.
+
+        :param sample: The sample.
+        """
+        for bom, encoding in EncodingDetector.boms:
+            if sample.startswith(bom):
+                return encoding
+
+        return None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _detect_utf8(self, sample: bytes) -> Optional[str]:
+        """
+        Returns utf-8 if the sample is valid UTF-8. The sample may end in an incomplete character.
+
+        :param sample: The sample.
+        """
+        if not sample:
+            return None
+
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        except UnicodeDecodeError:
+            return None
+
+        return 'utf-8'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _detect_fast(self, sample: bytes) -> Optional[str]:
+        """
+        Returns the encoding of a sample as detected by a faster detector than chardet, if installed.
+
+        :param sample: The sample.
+        """
+        if cchardet is not None:
+            return cchardet.detect(sample)['encoding']
+
+        if charset_normalizer is not None:
+            match = charset_normalizer.from_bytes(sample).best()
+            if match is not None:
+                return match.encoding
+
+        return None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _detect_chardet(self, sample: bytes) -> Optional[str]:
+        """
+        Returns the encoding of a sample as detected by chardet.
+
+        :param sample: The sample.
+        """
+        if not self._incremental:
+            return chardet.detect(sample)['encoding']
+
+        detector = chardet.UniversalDetector()
+        for offset in range(0, len(sample), self._chunk_size):
+            detector.feed(sample[offset:offset + self._chunk_size])
+            if detector.done:
+                break
+        detector.close()
+
+        return detector.result['encoding']
+
+# ----------------------------------------------------------------------------------------------------------------------
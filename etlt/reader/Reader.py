@@ -1,6 +1,6 @@
 import abc
 import copy
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class Reader(metaclass=abc.ABCMeta):
@@ -24,6 +24,11 @@ class Reader(metaclass=abc.ABCMeta):
         The row number for identifying the row in the source data.
         """
 
+        self._copy_on_write: bool = False
+        """
+        Whether rows yielded as dictionaries must be yielded as CopyOnWriteRow objects.
+        """
+
     # ------------------------------------------------------------------------------------------------------------------
     @property
     def fields(self) -> Optional[List[str]]:
@@ -43,6 +48,25 @@ class Reader(metaclass=abc.ABCMeta):
         """
         self._fields = fields
 
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def copy_on_write(self) -> bool:
+        """
+        Getter for copy_on_write.
+        """
+        return self._copy_on_write
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @copy_on_write.setter
+    def copy_on_write(self, copy_on_write: bool) -> None:
+        """
+        Setter for copy_on_write. If set to True and this reader yields rows as dictionaries, this reader yields rows
+        as CopyOnWriteRow objects. Readers that do not support this setting yield ordinary dictionaries.
+
+        :param copy_on_write: Whether to yield rows as CopyOnWriteRow objects.
+        """
+        self._copy_on_write = copy_on_write
+
     # ------------------------------------------------------------------------------------------------------------------
     @property
     def row_number(self) -> int:
@@ -51,6 +75,14 @@ class Reader(metaclass=abc.ABCMeta):
         """
         return self._row_number
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the position of this reader directly after the most recently yielded row from which reading can be
+        resumed. Returns None if this reader does not support (or has not enabled) checkpoints.
+        """
+        return None
+
     # ------------------------------------------------------------------------------------------------------------------
     @abc.abstractmethod
     def get_source_name(self) -> str:
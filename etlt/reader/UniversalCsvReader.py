@@ -1,33 +1,74 @@
 import bz2
+import codecs
+import collections
 import copy
 import csv
-from itertools import zip_longest
-from typing import Dict, List, Optional, Union
-
-import chardet
-
+import gzip
+import io
+import locale
+import lzma
+import mmap
+import operator
+import os
+import queue
+import re
+import threading
+from collections import deque
+from itertools import chain, zip_longest
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+from etlt.helper.CopyOnWriteRow import CopyOnWriteRow
+from etlt.helper.ReplayStream import ReplayStream
+from etlt.reader.EncodingDetector import EncodingDetector
 from etlt.reader.Reader import Reader
+from etlt.reader.UniversalCsvReaderFormatCache import UniversalCsvReaderFormatCache
 from etlt.reader.UniversalCsvReaderFormatHelper import UniversalCsvReaderFormatHelper
 
 
 class UniversalCsvReader(Reader):
     """
     A universal CSV file reader.
-    - Open uncompressed and gz, bz2 compressed files.
+    - Open uncompressed and gz, bz2, xz, and zstd (if the zstandard module is installed) compressed files. The
+      compression is detected by the magic bytes of the file.
     - Auto encoding and field delimiter detection.
     """
     sample_size = 64 * 1024
 
+    buffer_size = 1024 * 1024
+
+    prefetch_chunk_size = 1000
+
+    prefetch_queue_size = 16
+
+    # A bz2 stream starts with the block size and the magic of either the first block or the end of the stream (for
+    # empty input) such that plain text starting with "BZh" is not mistaken for bz2.
+    compressions = [(re.compile(rb'\x1f\x8b'), 'gz'),
+                    (re.compile(rb'BZh[1-9](1AY&SY|\x17rE8P\x90)'), 'bz2'),
+                    (re.compile(rb'\xfd7zXZ\x00'), 'xz'),
+                    (re.compile(rb'\x28\xb5\x2f\xfd'), 'zst')]
+
     line_endings = ['\r\n', '\n\r', '\n', '\r']
 
     delimiters = [',', ';', '\t', '|', ':']
 
     # ------------------------------------------------------------------------------------------------------------------
-    def __init__(self, filenames: List[str], format_helper=None):
+    def __init__(self,
+                 filenames: List[str],
+                 format_helper=None,
+                 format_cache: Optional[UniversalCsvReaderFormatCache] = None,
+                 encoding_detector: Optional[EncodingDetector] = None):
         """
         Object constructor.
 
         :param list(str) filenames: A list of CSV file names.
+        :param format_helper: The helper for detecting the appropriate formatting parameters.
+        :param format_cache: The optional cache for automatically detected formatting parameters.
+        :param encoding_detector: The detector for the encoding of the CSV files.
         """
         Reader.__init__(self)
 
@@ -41,6 +82,21 @@ class UniversalCsvReader(Reader):
         The current actual file object.
         """
 
+        self._raw_file: Optional[BinaryIO] = None
+        """
+        The current file object of the file on disk.
+        """
+
+        self._compression: Optional[str] = None
+        """
+        The compression format of the current file. None if the current file is not compressed.
+        """
+
+        self._map: Optional[mmap.mmap] = None
+        """
+        The memory map of the current file.
+        """
+
         self._csv_reader = None
         """
         The current actual CSV file object.
@@ -48,6 +104,11 @@ class UniversalCsvReader(Reader):
         :type: _csv.reader
         """
 
+        self._lines: Optional[Iterator[str]] = None
+        """
+        The lines of the current file.
+        """
+
         self._mapping: Optional[Dict[str, int]] = None
         """
         The mapping from column names to column numbers.
@@ -63,6 +124,16 @@ class UniversalCsvReader(Reader):
         The helper for detecting the appropriate formatting parameters for reading the current CSV file.
         """
 
+        self._format_cache: Optional[UniversalCsvReaderFormatCache] = format_cache
+        """
+        The optional cache for automatically detected formatting parameters.
+        """
+
+        self._encoding_detector: EncodingDetector = encoding_detector if encoding_detector else EncodingDetector()
+        """
+        The detector for the encoding of the CSV files.
+        """
+
         self._formatting_parameters: Dict[str, str] = dict()
         """
         The CSV formatting parameters for reading the current CSV file.
@@ -73,6 +144,47 @@ class UniversalCsvReader(Reader):
         The sample when detecting automatically formatting parameters.
         """
 
+        self._head: bytes = b''
+        """
+        The head of the current file, read once for detecting automatically formatting parameters.
+        """
+
+        self._row_type: str = 'dict'
+        """
+        The type of the rows yielded when mapping or fields is set.
+        """
+
+        self._prefetch: int = 0
+        """
+        The number of files to read ahead in background threads.
+        """
+
+        self._memory_map: bool = False
+        """
+        Whether to read uncompressed files through a memory map.
+        """
+
+        self._checkpoints: bool = False
+        """
+        Whether to keep track of checkpoints.
+        """
+
+        self._file_index: int = 0
+        """
+        The index of the current file in the list of CSV files.
+        """
+
+        self._offset: Optional[int] = 0
+        """
+        The byte offset in the (decompressed) current file directly after the most recently yielded row. None if not
+        tracked.
+        """
+
+        self._resume_checkpoint: Optional[Dict[str, Any]] = None
+        """
+        The checkpoint from which to resume reading.
+        """
+
     # ------------------------------------------------------------------------------------------------------------------
     def __enter__(self):
         # Nothing to do.
@@ -94,25 +206,311 @@ class UniversalCsvReader(Reader):
         """
         Yields the next row from the source files.
         """
-        for self._filename in self._filenames:
-            self._open()
-            for row in self._csv_reader:
+        if self._prefetch > 0 and not self._checkpoints and not self._resume_checkpoint:
+            yield from self._next_prefetched()
+            return
+
+        resume = self._resume_checkpoint
+        self._resume_checkpoint = None
+        self._file_index = resume['file_index'] if resume else 0
+        self._offset = 0
+        self._row_number = -1
+
+        converter = self._get_row_converter()
+        projection = self._get_projection()
+        while self._file_index < len(self._filenames):
+            self._filename = self._filenames[self._file_index]
+            if resume and resume['offset']:
+                self._open(resume['offset'])
+            else:
+                self._open()
+
+            if resume:
+                if self._offset is None or resume['offset'] is None:
+                    for _ in range(resume['row_number'] + 1):
+                        next(self._csv_reader, None)
+                self._row_number = resume['row_number']
+                resume = None
+
+            rows = self._csv_reader if projection is None else self._split_rows(projection)
+            for row in rows:
                 self._row_number += 1
-                if self._mapping:
-                    yield {column_name: row[index] if 0 <= index < len(row) else '' for column_name, index in
-                           self._mapping.items()}
-                elif self._fields:
-                    yield dict(zip_longest(self._fields, row, fillvalue=''))
-                else:
-                    yield row
+                yield converter(row)
 
             self._close()
             self._row_number = -1
+            self._file_index += 1
+            self._offset = 0
 
         self._filename = None
 
         return
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_projection(self) -> Optional[int]:
+        """
+        Returns the maximum number of splits required for extracting the columns in the mapping from a line. Returns
+        None if all columns are required.
+        """
+        if not self._mapping or min(self._mapping.values()) < 0:
+            return None
+
+        return max(self._mapping.values()) + 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _split_rows(self, maxsplit: int) -> Iterator[List[str]]:
+        """
+        Yields the rows of the current file with at least the columns in the mapping. Lines without quote and escape
+        characters are split at the first maxsplit delimiters only, such that the remaining columns are never split
+        into separate strings. Other lines are parsed by the CSV reader.
+
+        :param maxsplit: The maximum number of splits.
+        """
+        delimiter = self._formatting_parameters['delimiter']
+        quote_char = self._formatting_parameters['quote_char']
+        escape_char = self._formatting_parameters['escape_char']
+        dialect = self._get_dialect()
+        lines = self._lines
+        for line in lines:
+            if (quote_char and quote_char in line) or (escape_char and escape_char in line):
+                yield next(csv.reader(chain((line,), lines), **dialect))
+            elif line[-1:] == '\n':
+                yield line[:-1].split(delimiter, maxsplit)
+            else:
+                yield line.split(delimiter, maxsplit)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the position of this reader directly after the most recently yielded row from which reading can be
+        resumed: the index and name of the current file, the byte offset in the (decompressed) current file (None if
+        not tracked), and the row number. Returns None if checkpoints is not enabled.
+        """
+        if not self._checkpoints:
+            return None
+
+        return {'file_index': self._file_index,
+                'filename':   self._filenames[self._file_index] if self._file_index < len(self._filenames) else None,
+                'offset':     self._offset,
+                'row_number': self._row_number}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def resume(self, checkpoint: Dict[str, Any]) -> None:
+        """
+        Resumes reading, at the next call of next, directly after the position of a checkpoint. When the byte offset
+        has been tracked, uncompressed files are read from the byte offset onward and compressed files are decompressed
+        up to the byte offset without parsing. Otherwise, the rows up to the checkpoint are parsed and skipped.
+
+        :param checkpoint: The checkpoint as returned by get_checkpoint.
+        """
+        file_index = checkpoint['file_index']
+        filename = self._filenames[file_index] if file_index < len(self._filenames) else None
+        if filename != checkpoint['filename']:
+            raise ValueError('Checkpoint for file {0!s} does not match file {1!s}'.format(checkpoint['filename'],
+                                                                                         filename))
+
+        self._resume_checkpoint = checkpoint
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _next_prefetched(self):
+        """
+        Yields the next row from the source files while the next files are read in background threads.
+        """
+        filenames = iter(self._filenames)
+        pending = deque()
+        stop = threading.Event()
+
+        def start_next() -> None:
+            filename = next(filenames, None)
+            if filename is not None:
+                rows_queue = queue.Queue(UniversalCsvReader.prefetch_queue_size)
+                thread = threading.Thread(target=self._prefetch_file,
+                                          args=(filename, rows_queue, stop),
+                                          name='etlt-prefetch',
+                                          daemon=True)
+                thread.start()
+                pending.append((filename, rows_queue, thread))
+
+        try:
+            for _ in range(self._prefetch):
+                start_next()
+
+            while True:
+                start_next()
+                if not pending:
+                    break
+
+                self._filename, rows_queue, thread = pending.popleft()
+                while True:
+                    rows = rows_queue.get()
+                    if rows is None:
+                        break
+                    if isinstance(rows, BaseException):
+                        raise rows
+                    for row in rows:
+                        self._row_number += 1
+                        yield row
+
+                thread.join()
+                self._row_number = -1
+        finally:
+            stop.set()
+
+        self._filename = None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _prefetch_file(self, filename: str, rows_queue: queue.Queue, stop: threading.Event) -> None:
+        """
+        Reads a file in a background thread and puts chunks of rows, followed by None, on a queue. In case of an
+        exception the exception is put on the queue.
+
+        :param filename: The name of the file.
+        :param rows_queue: The queue for the chunks of rows.
+        :param stop: Event for stopping reading the file.
+        """
+        reader = self._clone(filename)
+        try:
+            rows = []
+            for row in reader.next():
+                rows.append(row)
+                if len(rows) == UniversalCsvReader.prefetch_chunk_size:
+                    if not self._put_prefetched(rows_queue, rows, stop):
+                        return
+                    rows = []
+
+            if self._put_prefetched(rows_queue, rows, stop):
+                self._put_prefetched(rows_queue, None, stop)
+        except BaseException as exception:
+            self._put_prefetched(rows_queue, exception, stop)
+        finally:
+            reader._close()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _put_prefetched(rows_queue: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """
+        Puts an item on a queue of prefetched rows. Returns False if reading has been stopped.
+
+        :param rows_queue: The queue.
+        :param item: The item.
+        :param stop: Event for stopping reading.
+        """
+        while not stop.is_set():
+            try:
+                rows_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _clone(self, filename: str):
+        """
+        Returns a reader with the same settings as this reader for reading a single file.
+
+        :param filename: The name of the file.
+        """
+        reader = copy.copy(self)
+        reader._filenames = [filename]
+        reader._prefetch = 0
+        reader._file = None
+        reader._raw_file = None
+        reader._compression = None
+        reader._map = None
+        reader._csv_reader = None
+        reader._filename = None
+        reader._row_number = -1
+        reader._formatting_parameters = dict()
+        reader._sample = None
+        reader._head = b''
+
+        return reader
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _is_ascii_compatible(self) -> bool:
+        """
+        Returns whether the encoding of the current file is ASCII compatible, i.e. line endings and the delimiter,
+        quote, and escape characters are encoded as single ASCII bytes.
+        """
+        encoding = self._formatting_parameters['encoding']
+        if not encoding:
+            return False
+
+        special = '\r\n' + self._formatting_parameters['delimiter'] + \
+                  (self._formatting_parameters['quote_char'] or '') + \
+                  (self._formatting_parameters['escape_char'] or '')
+        try:
+            encoded = special.encode(encoding)
+        except (LookupError, UnicodeEncodeError):
+            return False
+
+        return encoded in (special.encode('ascii'), codecs.BOM_UTF8 + special.encode('ascii'))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_dialect(self) -> Dict[str, str]:
+        """
+        Returns the formatting parameters for the CSV reader for the current file.
+        """
+        return {'delimiter':      self._formatting_parameters['delimiter'],
+                'escapechar':     self._formatting_parameters['escape_char'],
+                'lineterminator': self._formatting_parameters['line_terminator'],
+                'quotechar':      self._formatting_parameters['quote_char']}  # Ignored
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_row_converter(self) -> Callable:
+        """
+        Returns a function for converting a row from the CSV reader to a row as yielded by this reader.
+        """
+        if self._mapping:
+            names = tuple(self._mapping.keys())
+            indexes = tuple(self._mapping.values())
+            if min(indexes) < 0:
+                return self._convert_row_mapping_generic
+        elif self._fields:
+            names = tuple(self._fields)
+            indexes = tuple(range(len(names)))
+        else:
+            return lambda row: row
+
+        width = max(indexes) + 1
+        getter = operator.itemgetter(*indexes) if len(indexes) > 1 else lambda row: (row[indexes[0]],)
+
+        def values(row: List[str]) -> tuple:
+            if len(row) < width:
+                row = row + [''] * (width - len(row))
+
+            return getter(row)
+
+        if self._row_type == 'tuple':
+            return values
+
+        if self._row_type == 'namedtuple':
+            record_class = collections.namedtuple('Row', names, rename=True)
+
+            return lambda row: tuple.__new__(record_class, values(row))
+
+        row_class = CopyOnWriteRow if self._copy_on_write else dict
+        if self._mapping:
+            return lambda row: row_class(zip(names, values(row)))
+
+        fields = self._fields
+
+        return lambda row: row_class(zip(fields, row)) if len(row) == width else \
+            row_class(zip_longest(fields, row, fillvalue=''))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _convert_row_mapping_generic(self, row: List[str]) -> Dict[str, str]:
+        """
+        Converts a row from the CSV reader to a dictionary using the mapping, allowing any column number.
+
+        :param row: The row from the CSV reader.
+        """
+        row_class = CopyOnWriteRow if self._copy_on_write else dict
+
+        return row_class((column_name, row[index] if 0 <= index < len(row) else '') for column_name, index in
+                         self._mapping.items())
+
     # ------------------------------------------------------------------------------------------------------------------
     @property
     def mapping(self) -> Optional[Dict[str, int]]:
@@ -125,22 +523,138 @@ class UniversalCsvReader(Reader):
     @mapping.setter
     def mapping(self, mapping: Optional[Dict[str, int]]):
         """
+        Setter for mapping. The mapping from column names to column numbers. The mapping is pushed down to parsing:
+        unquoted lines are split up to the highest column number in the mapping only.
 
+        :param mapping: The mapping from column names to column numbers.
         """
         self._mapping = mapping
 
     # ------------------------------------------------------------------------------------------------------------------
-    def _open_file(self, mode: str, encoding: Optional[str] = None) -> None:
+    @property
+    def row_type(self) -> str:
+        """
+        Getter for row_type.
+        """
+        return self._row_type
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @row_type.setter
+    def row_type(self, row_type: str) -> None:
         """
-        Opens the next current file.
+        Setter for row_type. The type of the rows yielded when mapping or fields is set:
+        - dict: a dictionary with the column names as keys (default).
+        - tuple: a tuple with the values in the order of the column names.
+        - namedtuple: a named tuple with the column names as field names (invalid names are replaced with _<n>).
 
-        :param mode: The mode for opening the file.
-        :param encoding: The encoding of the file.
+        :param row_type: The type of the rows.
+        """
+        if row_type not in ('dict', 'tuple', 'namedtuple'):
+            raise ValueError('Unknown row type: {0!s}'.format(row_type))
+
+        self._row_type = row_type
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def prefetch(self) -> int:
+        """
+        Getter for prefetch.
+        """
+        return self._prefetch
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @prefetch.setter
+    def prefetch(self, prefetch: int) -> None:
+        """
+        Setter for prefetch. The number of files to open, decompress, and parse ahead in background threads with
+        bounded queues. Rows are still yielded in file order. When prefetching, the format helper and the encoding
+        detector are used from multiple threads. 0 (default) for reading the files one after another.
+
+        :param prefetch: The number of files to read ahead.
+        """
+        self._prefetch = prefetch
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def memory_map(self) -> bool:
+        """
+        Getter for memory_map.
+        """
+        return self._memory_map
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @memory_map.setter
+    def memory_map(self, memory_map: bool) -> None:
+        """
+        Setter for memory_map. If True, uncompressed files with an ASCII compatible encoding are read through a memory
+        map, bypassing the buffered text I/O layer. The sample for auto-detecting formatting parameters is a slice of
+        the map.
+
+        :param memory_map: Whether to read uncompressed files through a memory map.
+        """
+        self._memory_map = memory_map
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @property
+    def checkpoints(self) -> bool:
+        """
+        Getter for checkpoints.
         """
-        if self._filename[-4:] == '.bz2':
-            self._file = bz2.open(self._filename, mode=mode, encoding=encoding)
+        return self._checkpoints
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @checkpoints.setter
+    def checkpoints(self, checkpoints: bool) -> None:
+        """
+        Setter for checkpoints. If True, this reader keeps track of the byte offset directly after each row such that
+        reading can be resumed from a checkpoint, see get_checkpoint and resume. Files with an encoding that is not
+        ASCII compatible or with only bare CR line endings are not tracked by byte offset. When enabled, files are read
+        one after another in the current process, i.e. prefetch and memory_map are not applicable.
+
+        :param checkpoints: Whether to keep track of checkpoints.
+        """
+        self._checkpoints = checkpoints
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _open_file(self) -> None:
+        """
+        Opens the next current file in binary mode, decompressing the file if required.
+        """
+        self._raw_file = open(self._filename, mode='rb', buffering=UniversalCsvReader.buffer_size)
+        compression = self._detect_compression(self._raw_file.peek(10))
+        self._compression = compression
+
+        if compression == 'gz':
+            self._file = gzip.GzipFile(fileobj=self._raw_file, mode='rb')
+        elif compression == 'bz2':
+            self._file = bz2.BZ2File(self._raw_file, mode='rb')
+        elif compression == 'xz':
+            self._file = lzma.LZMAFile(self._raw_file, mode='rb')
+        elif compression == 'zst':
+            if zstandard is None:
+                raise ValueError('Reading zstd compressed file {0!s} requires the zstandard module'.
+                                 format(self._filename))
+            self._file = zstandard.ZstdDecompressor().stream_reader(self._raw_file,
+                                                                    read_size=UniversalCsvReader.buffer_size,
+                                                                    read_across_frames=True)
         else:
-            self._file = open(self._filename, mode=mode, encoding=encoding)
+            self._file = self._raw_file
+            if self._memory_map and os.fstat(self._raw_file.fileno()).st_size > 0:
+                self._map = mmap.mmap(self._raw_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _detect_compression(magic: bytes) -> Optional[str]:
+        """
+        Returns the compression format given the first bytes of a file. Returns None if the file is not compressed.
+
+        :param magic: The first bytes of the file.
+        """
+        for pattern, compression in UniversalCsvReader.compressions:
+            if pattern.match(magic):
+                return compression
+
+        return None
 
     # ------------------------------------------------------------------------------------------------------------------
     def _close(self) -> None:
@@ -149,25 +663,170 @@ class UniversalCsvReader(Reader):
         """
         if self._file:
             self._file.close()
+        if self._map:
+            self._map.close()
+            self._map = None
+        if self._raw_file:
+            self._raw_file.close()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _read_head(self) -> None:
+        """
+        Reads the head of the current file as bytes and uses it as sample.
+        """
+        if not self._head:
+            if self._map is not None:
+                self._head = self._map[:UniversalCsvReader.sample_size]
+            else:
+                self._head = self._file.read(UniversalCsvReader.sample_size)
+        self._sample = self._head
 
     # ------------------------------------------------------------------------------------------------------------------
-    def _get_sample(self, mode: str, encoding: Optional[str]) -> None:
+    def _decode_sample(self, encoding: Optional[str]) -> None:
         """
-        Get a sample from the next current input file.
+        Decodes the head of the current file in memory and uses it as sample. Like reading the file in text mode, all
+        line endings are translated to newline characters.
 
-        :param str mode: The mode for opening the file.
-        :param str|None encoding: The encoding of the file. None for open the file in binary mode.
+        :param str|None encoding: The encoding of the file.
         """
-        self._open_file(mode, encoding)
-        self._sample = self._file.read(UniversalCsvReader.sample_size)
-        self._file.close()
+        self._read_head()
+        decoder = codecs.getincrementaldecoder(encoding or locale.getpreferredencoding(False))()
+        decoder = io.IncrementalNewlineDecoder(decoder, translate=True)
+        self._sample = decoder.decode(self._head, final=False)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _open_text(self, encoding: Optional[str], offset: int) -> Iterator[str]:
+        """
+        Wraps the current binary file in a text stream, replaying the head of the file already read, and returns the
+        lines of the current file.
+
+        :param str|None encoding: The encoding of the file.
+        :param offset: The byte offset in the (decompressed) file from which to read.
+        """
+        if self._checkpoints or offset:
+            self._read_head()
+            if self._is_ascii_compatible() and not (b'\r' in self._head and b'\n' not in self._head):
+                return self._open_tracked(encoding, offset)
+            self._offset = None
+
+        if self._map is not None:
+            head = self._map[:UniversalCsvReader.sample_size]
+            if self._is_ascii_compatible() and not (b'\r' in head and b'\n' not in head):
+                self._head = b''
+
+                return self._read_map(encoding)
+
+            # The head has been sliced from the map, the file has not been read.
+            self._map.close()
+            self._map = None
+            self._head = b''
+
+        stream = io.BufferedReader(ReplayStream(self._head, self._file), UniversalCsvReader.buffer_size)
+        self._file = io.TextIOWrapper(stream, encoding=encoding)
+        self._head = b''
+
+        return self._file
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _open_tracked(self, encoding: Optional[str], offset: int) -> Iterator[str]:
+        """
+        Opens the current file in binary mode starting at a byte offset and returns the lines of the current file
+        while keeping track of the byte offset.
+
+        :param str|None encoding: The encoding of the file.
+        :param offset: The byte offset in the (decompressed) file from which to read.
+        """
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._head = b''
+
+        if offset and self._compression is None:
+            self._raw_file.seek(offset)
+            self._file = self._raw_file
+        else:
+            self._file = io.BufferedReader(ReplayStream(self._head, self._file), UniversalCsvReader.buffer_size)
+            remaining = offset
+            while remaining > 0:
+                data = self._file.read(min(remaining, UniversalCsvReader.buffer_size))
+                if not data:
+                    break
+                remaining -= len(data)
+        self._head = b''
+        self._offset = offset
+
+        return self._read_tracked(self._file, encoding)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _read_tracked(self, stream: BinaryIO, encoding: Optional[str]) -> Iterator[str]:
+        """
+        Yields the lines of a binary stream while keeping track of the byte offset directly after the most recently
+        yielded line. Like reading the file in text mode, all line endings (including bare CR characters in a file
+        with LF or CRLF line endings) end a line and are translated to newline characters.
+
+        :param stream: The binary stream.
+        :param str|None encoding: The encoding of the file.
+        """
+        decoder = codecs.getincrementaldecoder(encoding or locale.getpreferredencoding(False))()
+        for line in stream:
+            if line.endswith(b'\r\n'):
+                body, ending = line[:-2], 2
+            elif line.endswith(b'\n') or line.endswith(b'\r'):
+                body, ending = line[:-1], 1
+            else:
+                body, ending = line, 0
+
+            if b'\r' in body:
+                # The encoding is ASCII compatible, hence, splitting at a CR byte never splits a character.
+                *lines, body = body.split(b'\r')
+                for physical_line in lines:
+                    self._offset += len(physical_line) + 1
+                    yield decoder.decode(physical_line) + '\n'
+
+            self._offset += len(body) + ending
+            yield decoder.decode(body) + ('\n' if ending else '')
+
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _read_map(self, encoding: str) -> Iterator[str]:
+        """
+        Returns an iterator over the lines of the current file from its memory map. Like reading the file in text mode,
+        all line endings are translated to newline characters.
+
+        :param encoding: The encoding of the file.
+        """
+        return chain.from_iterable(io.StringIO(chunk.decode(encoding), newline=None) for chunk in self._map_chunks())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _map_chunks(self) -> Iterator[bytes]:
+        """
+        Yields the memory map of the current file in chunks of approximately the buffer size ending at a line feed.
+        """
+        mapped = self._map
+        size = len(mapped)
+        start = 0
+        while start < size:
+            end = start + UniversalCsvReader.buffer_size
+            if end >= size:
+                end = size
+            else:
+                index = mapped.rfind(b'\n', start, end)
+                if index == -1:
+                    index = mapped.find(b'\n', end)
+                end = index + 1 if index != -1 else size
+
+            yield mapped[start:end]
+            start = end
 
     # ------------------------------------------------------------------------------------------------------------------
     def _detect_encoding(self) -> None:
         """
         Detects the encoding og the current file.
         """
-        self._formatting_parameters['encoding'] = chardet.detect(self._sample)['encoding']
+        self._formatting_parameters['encoding'] = self._encoding_detector.detect(self._sample)
 
     # ------------------------------------------------------------------------------------------------------------------
     def _detect_delimiter(self) -> None:
@@ -200,11 +859,14 @@ class UniversalCsvReader(Reader):
         self._formatting_parameters['line_terminator'] = candidate_value
 
     # ------------------------------------------------------------------------------------------------------------------
-    def _open(self) -> None:
+    def _open(self, offset: int = 0) -> None:
         """
         Opens the next current file with proper settings for encoding and delimiter.
+
+        :param offset: The byte offset in the (decompressed) file from which to read.
         """
         self._sample = None
+        self._head = b''
 
         formatting_parameters0 = {
                 'encoding':        'auto',
@@ -215,32 +877,46 @@ class UniversalCsvReader(Reader):
         formatting_parameters1 = self._helper.pass1(self._filename, formatting_parameters0)
         self._formatting_parameters = formatting_parameters1
 
+        self._open_file()
+
+        # Use cached formatting parameters.
+        signature = None
+        auto_keys = [key for key in ('encoding', 'delimiter', 'line_terminator') if
+                     formatting_parameters1[key] == 'auto']
+        if self._format_cache and auto_keys:
+            self._read_head()
+            signature = self._format_cache.signature(self._filename, self._head)
+            cached_parameters = self._format_cache.get(signature)
+            if cached_parameters:
+                for key in auto_keys:
+                    if key in cached_parameters:
+                        formatting_parameters1[key] = cached_parameters[key]
+
         # Detect encoding.
         if formatting_parameters1['encoding'] == 'auto':
-            self._get_sample('rb', None)
+            self._read_head()
             self._detect_encoding()
 
         # Detect delimiter.
         if formatting_parameters1['delimiter'] == 'auto':
-            self._get_sample('rt', formatting_parameters1['encoding'])
+            self._decode_sample(formatting_parameters1['encoding'])
             self._detect_delimiter()
 
         # Detect line terminators.
         if formatting_parameters1['line_terminator'] == 'auto':
-            if not self._sample:
-                self._get_sample('rt', formatting_parameters1['encoding'])
+            if not isinstance(self._sample, str):
+                self._decode_sample(formatting_parameters1['encoding'])
             self._detect_line_ending()
 
+        if signature is not None:
+            self._format_cache.put(signature, {key: formatting_parameters1[key] for key in auto_keys})
+
         self._formatting_parameters = self._helper.pass2(self._filename,
                                                          self._formatting_parameters,
                                                          formatting_parameters1)
 
-        self._open_file('rt', formatting_parameters1['encoding'])
-        self._csv_reader = csv.reader(self._file,
-                                      delimiter=self._formatting_parameters['delimiter'],
-                                      escapechar=self._formatting_parameters['escape_char'],
-                                      lineterminator=self._formatting_parameters['line_terminator'],
-                                      quotechar=self._formatting_parameters['quote_char'])  # Ignored
+        self._lines = self._open_text(formatting_parameters1['encoding'], offset)
+        self._csv_reader = csv.reader(self._lines, **self._get_dialect())
 
         self._sample = None
 
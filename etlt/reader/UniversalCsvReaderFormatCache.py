@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+
+class UniversalCsvReaderFormatCache:
+    """
+    A persistent cache for the formatting parameters detected automatically by UniversalCsvReader. The cache is stored
+    in a JSON file, is bounded in size, and evicts the least recently used entries first. The cache is thread safe.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, filename: str, max_size: int = 1000):
+        """
+        Object constructor.
+
+        :param filename: The path to the file for storing the cache.
+        :param max_size: The maximum number of entries in the cache.
+        """
+        self._filename: str = filename
+        """
+        The path to the file for storing the cache.
+        """
+
+        self._max_size: int = max_size
+        """
+        The maximum number of entries in the cache.
+        """
+
+        self._entries: Optional[Dict[str, Dict[str, Optional[str]]]] = None
+        """
+        The entries of the cache in least recently used first order. None if the cache has not been loaded yet.
+        """
+
+        self._lock: threading.RLock = threading.RLock()
+        """
+        The lock for accessing the entries of the cache.
+        """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def signature(self, filename: str, head: bytes) -> str:
+        """
+        Returns the signature of a CSV file, i.e. the key of the file in the cache. The signature consists of the base
+        name of the file with all digits replaced by # and the hash of the first line of the file.
+
+        Override this method in your own child class according to your needs.
+
+        :param filename: The name of the CSV file.
+        :param head: The head of the (decompressed) CSV file.
+        """
+        pattern = re.sub(r'\d+', '#', os.path.basename(filename))
+        header = head.split(b'\n', 1)[0]
+
+        return pattern + ':' + hashlib.sha1(header).hexdigest()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get(self, signature: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Returns the cached formatting parameters of a signature. Returns None if the signature is not in the cache.
+
+        :param signature: The signature.
+        """
+        with self._lock:
+            entries = self._load()
+            formatting_parameters = entries.pop(signature, None)
+            if formatting_parameters is not None:
+                entries[signature] = formatting_parameters
+
+        return formatting_parameters
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def put(self, signature: str, formatting_parameters: Dict[str, Optional[str]]) -> None:
+        """
+        Stores formatting parameters of a signature in the cache.
+
+        :param signature: The signature.
+        :param formatting_parameters: The detected formatting parameters.
+        """
+        with self._lock:
+            entries = self._load()
+            old_parameters = entries.pop(signature, {})
+            new_parameters = dict(old_parameters, **formatting_parameters)
+            entries[signature] = new_parameters
+
+            if new_parameters != old_parameters:
+                while len(entries) > self._max_size:
+                    del entries[next(iter(entries))]
+                self.save()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def save(self) -> None:
+        """
+        Writes the cache to its file.
+        """
+        with self._lock:
+            if self._entries is None:
+                return
+
+            tmp_filename = self._filename + '.tmp'
+            with open(tmp_filename, 'wt', encoding='utf-8') as file:
+                json.dump(self._entries, file)
+            os.replace(tmp_filename, self._filename)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """
+        Loads the cache from its file, if not loaded already, and returns the entries of the cache.
+        """
+        if self._entries is None:
+            try:
+                with open(self._filename, 'rt', encoding='utf-8') as file:
+                    self._entries = json.load(file)
+            except (FileNotFoundError, ValueError):
+                self._entries = dict()
+
+        return self._entries
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -1,5 +1,8 @@
 import abc
-from typing import Any, Optional
+import io
+import os
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Union
 
 from etlt.writer.Writer import Writer
 
@@ -10,9 +13,16 @@ class SqlLoaderWriter(Writer):
     """
     handlers = {}
     """
-    The handlers for writing objects as a field to a CSV file.
+    The handlers for writing objects as a field to a CSV file keyed by class or class name (i.e. str(class)).
 
-    :type: dict[str,callable]
+    :type: dict[type|str,callable]
+    """
+
+    _instances = weakref.WeakSet()
+    """
+    All writers, for clearing their handler caches when a handler is registered.
+
+    :type: weakref.WeakSet[SqlLoaderWriter]
     """
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -40,14 +50,88 @@ class SqlLoaderWriter(Writer):
         The underling file object.
         """
 
+        self._part: int = 0
+        """
+        The number of times the destination file has been rotated.
+        """
+
+        self.buffer_size: int = 1024 * 1024
+        """
+        The size (in characters) of the blocks of rows built in memory by writerows before writing the block to the
+        destination file.
+        """
+
+        self._handler_cache: Dict[type, Optional[callable]] = {}
+        """
+        The handlers resolved for the classes of the values written so far. None if no handler has been registered for
+        a class.
+        """
+
+        self.learn_rows: int = 100
+        """
+        The number of rows written by _write_row from which the classes of the values of each column are learned
+        before compiling a row serializer.
+        """
+
+        self._column_classes: List[List[type]] = []
+        """
+        The classes of the values of each column written so far by _write_row.
+        """
+
+        self._learned_rows: int = 0
+        """
+        The number of rows written by _write_row so far.
+        """
+
+        self._serializer: Optional[callable] = None
+        """
+        The row serializer compiled for the learned classes of the values of each column.
+        """
+
+        self._serializer_fields: Optional[List[str]] = None
+        """
+        The fields for which the classes of the values of each column are learned.
+        """
+
+        SqlLoaderWriter._instances.add(self)
+
     # ------------------------------------------------------------------------------------------------------------------
     def __enter__(self):
         self._file = open(self._filename, mode='wt', encoding=self._encoding)
+        self._part = 0
 
     # ------------------------------------------------------------------------------------------------------------------
     def __exit__(self, exc_type, exc_value, traceback):
         self._file.close()
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Writes rows to the destination file. The rows are written by writerow to blocks of (approximately) buffer_size
+        characters in memory, each block is written to the destination file with a single write. If writing a row
+        fails, all preceding rows have been written to the destination file.
+
+        :param rows: The rows.
+        """
+        file = self._file
+        buffer = io.StringIO()
+        size = 0
+        self._file = buffer
+        try:
+            for row in rows:
+                self.writerow(row)
+                size = buffer.tell()
+                if size >= self.buffer_size:
+                    file.write(buffer.getvalue())
+                    buffer.seek(0)
+                    buffer.truncate()
+                    size = 0
+        finally:
+            self._file = file
+            # Write complete rows only.
+            if size:
+                file.write(buffer.getvalue()[:size])
+
     # ------------------------------------------------------------------------------------------------------------------
     @property
     def filename(self) -> str:
@@ -64,6 +148,30 @@ class SqlLoaderWriter(Writer):
         """
         return self._encoding
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def tell(self) -> int:
+        """
+        Returns the current position in the destination file.
+        """
+        return self._file.tell()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def rotate(self) -> str:
+        """
+        Closes the destination file, renames the destination file to a numbered part file, and opens a new destination
+        file. Returns the name of the part file.
+        """
+        self._file.close()
+
+        self._part += 1
+        root, ext = os.path.splitext(self._filename)
+        filename = '{0}.{1:d}{2}'.format(root, self._part, ext)
+        os.replace(self._filename, filename)
+
+        self._file = open(self._filename, mode='wt', encoding=self._encoding)
+
+        return filename
+
     # ------------------------------------------------------------------------------------------------------------------
     @abc.abstractmethod
     def get_bulk_load_sql(self, table_name: str, partition: Optional[str] = None) -> str:
@@ -77,16 +185,21 @@ class SqlLoaderWriter(Writer):
 
     # ------------------------------------------------------------------------------------------------------------------
     @staticmethod
-    def register_handler(class_name: str, handler: callable) -> None:
+    def register_handler(class_name: Union[type, str], handler: callable) -> None:
         """
-        Registers a handler for writing instances of a class as a field to the destination file.
+        Registers a handler for writing instances of a class, and instances of subclasses of the class without a
+        handler of their own, as a field to the destination file.
 
-        :param class_name: The name of the class.
+        :param class_name: The class or the name of the class (i.e. str(class)).
         :param handler: The handler. This handler will be called with two arguments: the object which value must be
                         writen to the destination file, the file handler.
         """
         SqlLoaderWriter.handlers[class_name] = handler
 
+        for writer in SqlLoaderWriter._instances:
+            writer._handler_cache.clear()
+            writer._serializer = None
+
     # ------------------------------------------------------------------------------------------------------------------
     def _write_field(self, value: Any):
         """
@@ -94,10 +207,125 @@ class SqlLoaderWriter(Writer):
 
         :param value: The value of the field.
         """
-        class_name = str(value.__class__)
-        if class_name not in self.handlers:
-            raise ValueError('No handler has been registered for class: {0!s}'.format(class_name))
-        handler = self.handlers[class_name]
+        handler = self._handler_cache.get(value.__class__)
+        if handler is None:
+            handler = self._get_handler(value.__class__)
         handler(value, self._file)
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_handler(self, cls: type) -> callable:
+        """
+        Returns the handler for writing instances of a class as a field to the destination file. The handler is
+        resolved along the MRO of the class and is cached, as well as the absence of a handler.
+
+        :param cls: The class.
+        """
+        if cls in self._handler_cache:
+            handler = self._handler_cache[cls]
+        else:
+            handler = None
+            for base in cls.__mro__:
+                handler = self.handlers.get(base) or self.handlers.get(str(base))
+                if handler is not None:
+                    break
+            self._handler_cache[cls] = handler
+
+        if handler is None:
+            raise ValueError('No handler has been registered for class: {0!s}'.format(cls))
+
+        return handler
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _write_row(self, row: Dict[str, Any], separator: str, terminator: str) -> None:
+        """
+        Writes the fields of a row separated by a separator and followed by a terminator to the destination file. Can
+        be used by writerow of a child class.
+
+        After learn_rows rows, the row is written by a row serializer with the handlers of the learned classes of the
+        values of each column directly to the destination file (or the block of writerows). When a value of another
+        class is encountered, the row is written field by field and the row serializer is compiled again.
+
+        :param row: The row.
+        :param separator: The separator between the fields.
+        :param terminator: The terminator of the row.
+        """
+        if self._serializer is not None and self._serializer_fields is self._fields:
+            if self._serializer(row, self._file):
+                return
+
+        for index, field in enumerate(self._fields):
+            if index:
+                self._file.write(separator)
+            self._write_field(row[field])
+        self._file.write(terminator)
+
+        self._learn_row(row, separator, terminator)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _learn_row(self, row: Dict[str, Any], separator: str, terminator: str) -> None:
+        """
+        Learns the classes of the values of each column of a row written field by field and compiles the row
+        serializer when applicable.
+
+        :param row: The row.
+        :param separator: The separator between the fields.
+        :param terminator: The terminator of the row.
+        """
+        if self._serializer_fields is not self._fields:
+            self._serializer_fields = self._fields
+            self._column_classes = [[] for _ in self._fields]
+            self._learned_rows = 0
+            self._serializer = None
+
+        for classes, field in zip(self._column_classes, self._fields):
+            cls = row[field].__class__
+            if cls not in classes:
+                classes.append(cls)
+                self._serializer = None
+
+        self._learned_rows += 1
+        if self._serializer is None and self._learned_rows >= self.learn_rows:
+            self._serializer = self._compile_serializer(separator, terminator)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _compile_serializer(self, separator: str, terminator: str) -> callable:
+        """
+        Returns a function that writes a row to a file with the handler of each value resolved by the learned classes
+        of the values of its column. The classes of all values are checked before writing, i.e. the function returns
+        False without writing anything when a value is of any other class.
+
+        :param separator: The separator between the fields.
+        :param terminator: The terminator of the row.
+        """
+        namespace = {}
+        lines = ['def _serialize(row, file):']
+        body = ['    write = file.write']
+        for index, (field, classes) in enumerate(zip(self._fields, self._column_classes)):
+            lines.append('    value{0:d} = row[{1!r}]'.format(index, field))
+            if len(classes) == 1:
+                namespace['class{0:d}_0'.format(index)] = classes[0]
+                namespace['handler{0:d}_0'.format(index)] = self._get_handler(classes[0])
+                lines.append('    if value{0:d}.__class__ is not class{0:d}_0:'.format(index))
+                lines.append('        return False')
+                handler = 'handler{0:d}_0'.format(index)
+            else:
+                lines.append('    cls = value{0:d}.__class__'.format(index))
+                for number, cls in enumerate(classes):
+                    namespace['class{0:d}_{1:d}'.format(index, number)] = cls
+                    namespace['handler{0:d}_{1:d}'.format(index, number)] = self._get_handler(cls)
+                    lines.append('    {0} cls is class{1:d}_{2:d}:'.format('elif' if number else 'if', index, number))
+                    lines.append('        handler{0:d} = handler{0:d}_{1:d}'.format(index, number))
+                lines.append('    else:')
+                lines.append('        return False')
+                handler = 'handler{0:d}'.format(index)
+            if index:
+                body.append('    write({0!r})'.format(separator))
+            body.append('    {0}(value{1:d}, file)'.format(handler, index))
+        body.append('    write({0!r})'.format(terminator))
+        body.append('    return True')
+
+        exec('\n'.join(lines + body), namespace)
+
+        return namespace['_serialize']
+
 # ----------------------------------------------------------------------------------------------------------------------
@@ -1,6 +1,6 @@
 import abc
 import copy
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 
 class Writer(metaclass=abc.ABCMeta):
@@ -47,6 +47,16 @@ class Writer(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError()
 
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """
+        Writes rows to the destination.
+
+        :param rows: The rows.
+        """
+        for row in rows:
+            self.writerow(row)
+
     # ------------------------------------------------------------------------------------------------------------------
     def __enter__(self):
         raise NotImplementedError()
@@ -0,0 +1,370 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from etlt.AsyncTransformer import AsyncTransformer
+from etlt.dimension.AsyncRegularDimension import AsyncRegularDimension
+from etlt.reader.Reader import Reader
+from etlt.writer.SqlLoaderWriter import SqlLoaderWriter
+
+
+class ListReader(Reader):
+    """
+    Reader for reading rows from a list.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, rows: List[Dict[str, Any]]):
+        Reader.__init__(self)
+
+        self.rows: List[Dict[str, Any]] = rows
+
+        self.checkpoints: bool = False
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __enter__(self):
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __exit__(self, *_):
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_source_name(self) -> str:
+        return 'list'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_checkpoint(self) -> Optional[Dict[str, Any]]:
+        return {'row_number': self._row_number} if self.checkpoints else None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def next(self):
+        for row in self.rows:
+            self._row_number += 1
+            yield dict(row)
+
+
+class SlowListReader(ListReader):
+    """
+    Reader for reading rows from a list with blocking I/O.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def next(self):
+        for row in ListReader.next(self):
+            time.sleep(0.005)
+            yield row
+
+
+class ListWriter(SqlLoaderWriter):
+    """
+    Writer for writing rows to a list.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, filename: str):
+        SqlLoaderWriter.__init__(self, filename)
+
+        self.rows: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerow(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+        self._file.write(repr(row) + '\n')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_bulk_load_sql(self, table_name: str, partition: Optional[str] = None) -> str:
+        return ''
+
+
+class FakeDimension(AsyncRegularDimension):
+    """
+    Dimension with an artificial latency of the stored procedure.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, latency: float, concurrency: int):
+        AsyncRegularDimension.__init__(self, concurrency)
+
+        self.latency: float = latency
+        self.calls: List[str] = []
+        self.active: int = 0
+        self.max_active: int = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def call_stored_procedure(self, natural_key: Any, enhancement: Any) -> Optional[int]:
+        self.calls.append(natural_key)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.latency)
+            if natural_key == 'fail':
+                raise ValueError(natural_key)
+        finally:
+            self.active -= 1
+
+        return None if natural_key == 'unknown' else int(natural_key[4:])
+
+
+class TestAsyncTransformer(AsyncTransformer):
+    """
+    Asynchronous transformer for testing.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, rows: List[Dict[str, Any]], directory: str, dimension: FakeDimension):
+        AsyncTransformer.__init__(self,
+                                  ListReader(rows),
+                                  ListWriter(os.path.join(directory, 'transformed.csv')),
+                                  ListWriter(os.path.join(directory, 'parked.csv')),
+                                  ListWriter(os.path.join(directory, 'ignored.csv')))
+
+        self.dimension: FakeDimension = dimension
+        self.errors: List[int] = []
+        self.loaded: List[str] = []
+        self.checkpoints: List[Dict[str, Any]] = []
+        self.loaded_parked: List[str] = []
+        self.loaded_ignored: List[str] = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _handle_exception(self, row: Dict[str, Any], exception: Exception) -> None:
+        self.errors.append(self._row_number)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step01(self, in_row: Dict[str, Any], tmp_row: Dict[str, Any], out_row: Dict[str, Any]) -> Tuple[
+        Optional[str], Optional[str]]:
+        if in_row['name'] == 'ignore':
+            return None, 'Ignored'
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def _step02(self, in_row: Dict[str, Any], tmp_row: Dict[str, Any], out_row: Dict[str, Any]) -> Tuple[
+        Optional[str], Optional[str]]:
+        out_row['name'] = in_row['name']
+        out_row['key'] = await self.dimension.get_id(in_row['key'])
+        if out_row['key'] is None:
+            return 'Unknown key', None
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_ignored_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_parked_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_transformed_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_transformed_file(self, filename: str) -> None:
+        with open(filename) as file:
+            self.loaded.append(file.read())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_parked_file(self, filename: str) -> None:
+        with open(filename) as file:
+            self.loaded_parked.append(file.read())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_ignored_file(self, filename: str) -> None:
+        with open(filename) as file:
+            self.loaded_ignored.append(file.read())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        self.checkpoints.append(checkpoint)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _log_statistics(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_input_fields(self) -> List[str]:
+        return ['name', 'key']
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_mandatory_fields(self) -> List[str]:
+        return ['name']
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_output_fields(self) -> List[str]:
+        return ['name', 'key']
+
+
+class AsyncTransformerTest(unittest.TestCase):
+    """
+    Test cases for AsyncTransformer.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _rows(count: int) -> List[Dict[str, Any]]:
+        """
+        Returns source rows for testing. Rows with a multiple of 3 share their key with the previous row.
+
+        :param count: The number of rows.
+        """
+        rows = []
+        for i in range(count):
+            if i % 10 == 4:
+                rows.append({'name': 'ignore', 'key': 'key-{0:d}'.format(i)})
+            elif i % 10 == 5:
+                rows.append({'name': 'error', 'key': 'fail'})
+            elif i % 10 == 7:
+                rows.append({'name': 'unknown', 'key': 'unknown'})
+            else:
+                rows.append({'name': 'row {0:d}'.format(i), 'key': 'key-{0:d}'.format(i - (i % 3 == 0))})
+
+        return rows
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_transform(self) -> None:
+        """
+        Test dimension lookups are run concurrently and rows are written in their original order.
+        """
+        dimension = FakeDimension(0.05, 10)
+        transformer = TestAsyncTransformer(self._rows(40), self._directory.name, dimension)
+        transformer.concurrency = 40
+
+        start = time.perf_counter()
+        transformer.transform_source_rows()
+        duration = time.perf_counter() - start
+
+        transformed = transformer._transformed_writer.rows
+        self.assertEqual(['row {0:d}'.format(i) for i in range(40) if i % 10 not in (4, 5, 7)],
+                         [row['name'] for row in transformed])
+        self.assertEqual([i - (i % 3 == 0) for i in range(40) if i % 10 not in (4, 5, 7)],
+                         [row['key'] for row in transformed])
+        self.assertEqual(['error', 'unknown'] * 4, [row['name'] for row in transformer._parked_writer.rows])
+        self.assertEqual([{'name': 'ignore', 'key': 'key-{0:d}'.format(i)} for i in range(4, 40, 10)],
+                         transformer._ignored_writer.rows)
+        self.assertEqual([5, 15, 25, 35], transformer.errors)
+        self.assertEqual((40, 28, 8, 4, 4), (transformer._count_total,
+                                             transformer._count_transform,
+                                             transformer._count_park,
+                                             transformer._count_ignore,
+                                             transformer._count_error))
+
+        # All rows are in flight at once, hence, lookups of the same key share a single call.
+        self.assertEqual(sorted(set(dimension.calls)), sorted(dimension.calls))
+        self.assertEqual(10, dimension.max_active)
+        self.assertLess(duration, 0.05 * len(dimension.calls) / 2)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_concurrency(self) -> None:
+        """
+        Test the number of rows in flight is limited by concurrency.
+        """
+        dimension = FakeDimension(0.01, 100)
+        transformer = TestAsyncTransformer(self._rows(40), self._directory.name, dimension)
+        transformer.concurrency = 3
+        transformer.transform_source_rows()
+
+        self.assertEqual(3, dimension.max_active)
+        self.assertEqual(28, len(transformer._transformed_writer.rows))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_transform_async(self) -> None:
+        """
+        Test transforming rows in the running event loop.
+        """
+
+        async def transform() -> asyncio.AbstractEventLoop:
+            await transformer.transform_source_rows_async()
+
+            return asyncio.get_running_loop()
+
+        dimension = FakeDimension(0.01, 10)
+        transformer = TestAsyncTransformer(self._rows(20), self._directory.name, dimension)
+        loop = asyncio.run(transform())
+
+        self.assertIs(loop, dimension._semaphore_loop)
+        self.assertEqual(14, len(transformer._transformed_writer.rows))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_event_loop_not_blocked(self) -> None:
+        """
+        Test blocking reading does not block the running event loop.
+        """
+
+        async def tick(done: asyncio.Event) -> int:
+            ticks = 0
+            while not done.is_set():
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+            return ticks
+
+        async def transform() -> int:
+            done = asyncio.Event()
+            ticker = asyncio.create_task(tick(done))
+            try:
+                await transformer.transform_source_rows_async()
+            finally:
+                done.set()
+
+            return await ticker
+
+        transformer = TestAsyncTransformer(self._rows(60), self._directory.name, FakeDimension(0.0, 10))
+        transformer._source_reader = SlowListReader(self._rows(60))
+        ticks = asyncio.run(transform())
+
+        self.assertEqual(42, len(transformer._transformed_writer.rows))
+        self.assertGreater(ticks, 30)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_concurrent_transformers(self) -> None:
+        """
+        Test more transformers than the default executor of the event loop has threads run concurrently in one event
+        loop.
+        """
+
+        async def transform() -> None:
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(2))
+            await asyncio.wait_for(asyncio.gather(*(transformer.transform_source_rows_async()
+                                                    for transformer in transformers)), 30.0)
+
+        transformers = []
+        for i in range(5):
+            directory = os.path.join(self._directory.name, str(i))
+            os.mkdir(directory)
+            transformer = TestAsyncTransformer(self._rows(60), directory, FakeDimension(0.0, 10))
+            transformer._source_reader = SlowListReader(self._rows(60))
+            transformers.append(transformer)
+        asyncio.run(transform())
+
+        for transformer in transformers:
+            self.assertEqual(42, len(transformer._transformed_writer.rows))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_save_checkpoint(self) -> None:
+        """
+        Test checkpoints of the source reader are saved for the chunks written, not the rows in flight.
+        """
+        transformer = TestAsyncTransformer(self._rows(100), self._directory.name, FakeDimension(0.0, 10))
+        transformer._source_reader.checkpoints = True
+        transformer.load_rows = 25
+        transformer.chunk_size = 10
+        transformer.transform_source_rows()
+
+        self.assertEqual([28, 28, 14], [len(part.splitlines()) for part in transformer.loaded])
+        self.assertEqual([{'row_number': 39}, {'row_number': 79}, {'row_number': 99}], transformer.checkpoints)
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,767 @@
+import contextlib
+import io
+import logging
+import os
+import tempfile
+import types
+import unittest
+import unittest.mock
+from typing import Any, Dict, List, Optional, Tuple
+
+from etlt.helper.CopyOnWriteRow import CopyOnWriteRow
+from etlt.metrics.MetricsSink import MetricsSink
+from etlt.reader.Reader import Reader
+from etlt.Transformer import Transformer
+from etlt.writer.SqlLoaderWriter import SqlLoaderWriter
+
+
+class ListMetricsSink(MetricsSink):
+    """
+    Metrics sink for collecting metrics in a list.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        self.metrics: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def emit(self, metrics: Dict[str, Any]) -> None:
+        self.metrics.append(metrics)
+
+
+class ListReader(Reader):
+    """
+    Reader for reading rows from a list.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, rows: List[Dict[str, Any]]):
+        Reader.__init__(self)
+
+        self.rows: List[Dict[str, Any]] = rows
+
+        self.checkpoints: bool = False
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __enter__(self):
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __exit__(self, *_):
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_source_name(self) -> str:
+        return 'list'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_checkpoint(self) -> Optional[Dict[str, Any]]:
+        return {'row_number': self._row_number} if self.checkpoints else None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def next(self):
+        row_class = CopyOnWriteRow if self._copy_on_write else dict
+        for row in self.rows:
+            self._row_number += 1
+            yield row_class(row)
+
+
+class ListWriter(SqlLoaderWriter):
+    """
+    Writer for writing rows to a list.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, filename: str):
+        SqlLoaderWriter.__init__(self, filename)
+
+        self.rows: List[Dict[str, Any]] = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerow(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+        self._file.write(repr(row) + '\n')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_bulk_load_sql(self, table_name: str, partition: Optional[str] = None) -> str:
+        return ''
+
+
+class TestTransformer(Transformer):
+    """
+    Transformer for testing.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, rows: List[Dict[str, Any]], directory: str):
+        Transformer.__init__(self,
+                             ListReader(rows),
+                             ListWriter(os.path.join(directory, 'transformed.csv')),
+                             ListWriter(os.path.join(directory, 'parked.csv')),
+                             ListWriter(os.path.join(directory, 'ignored.csv')))
+
+        self.errors: List[int] = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _handle_exception(self, row: Dict[str, Any], exception: Exception) -> None:
+        self.errors.append(self._row_number)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step01(self, in_row: Dict[str, Any], tmp_row: Dict[str, Any], out_row: Dict[str, Any]) -> Tuple[
+        Optional[str], Optional[str]]:
+        if in_row['name'] == 'ignore':
+            return None, 'Ignored'
+
+        tmp_row['number'] = int(in_row['number'])
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step02(self, in_row: Dict[str, Any], tmp_row: Dict[str, Any], out_row: Dict[str, Any]) -> Tuple[
+        Optional[str], Optional[str]]:
+        out_row['name'] = in_row['name']
+        out_row['square'] = tmp_row['number'] * tmp_row['number']
+
+        return None, None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_ignored_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_parked_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_transformed_rows(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _log_statistics(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_input_fields(self) -> List[str]:
+        return ['name', 'number']
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_mandatory_fields(self) -> List[str]:
+        return ['name']
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_output_fields(self) -> List[str]:
+        return ['name', 'square']
+
+
+class RowTestTransformer(TestTransformer):
+    """
+    Transformer for testing with an additional step.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _step015(self, in_row: Dict[str, Any], tmp_row: Dict[str, Any], out_row: Dict[str, Any]) -> Tuple[
+        Optional[str], Optional[str]]:
+        if tmp_row['number'] % 4 == 0:
+            return None, 'Multiple of 4'
+
+        return None, None
+
+
+class BatchTestTransformer(TestTransformer):
+    """
+    Transformer for testing with an additional batch step.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _batch_step015(self, rows: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]) -> List[
+        Tuple[Optional[str], Optional[str]]]:
+        infos = []
+        for in_row, tmp_row, out_row in rows:
+            if tmp_row['number'] % 4 == 0:
+                infos.append((None, 'Multiple of 4'))
+            else:
+                infos.append((None, None))
+
+        return infos
+
+
+class ShortBatchTestTransformer(TestTransformer):
+    """
+    Transformer for testing with a batch step returning too few results.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _batch_step015(self, rows: List[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]) -> List[
+        Tuple[Optional[str], Optional[str]]]:
+        return [(None, None)] * (len(rows) - 1)
+
+
+class SamplingTestTransformer(TestTransformer):
+    """
+    Transformer for testing logging exceptions.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _handle_exception(self, row: Dict[str, Any], exception: Exception) -> None:
+        Transformer._handle_exception(self, row, exception)
+
+
+class LegacyLogTestTransformer(SamplingTestTransformer):
+    """
+    Transformer for testing a child class overriding _log with a single argument.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, rows: List[Dict[str, Any]], directory: str):
+        SamplingTestTransformer.__init__(self, rows, directory)
+
+        self.messages: List[str] = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _log(self, message: str) -> None:
+        self.messages.append(message)
+
+
+class WhitespaceTestTransformer(TestTransformer):
+    """
+    Transformer for testing pruning whitespace of some fields only.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _get_whitespace_fields(self) -> Optional[List[str]]:
+        return ['number']
+
+
+class LoadingTestTransformer(TestTransformer):
+    """
+    Transformer for testing loading transformed rows while transforming rows.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, rows: List[Dict[str, Any]], directory: str):
+        TestTransformer.__init__(self, rows, directory)
+
+        self.loaded: List[str] = []
+        self.checkpoints: List[Dict[str, Any]] = []
+        self.loaded_parked: List[str] = []
+        self.loaded_ignored: List[str] = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_transformed_file(self, filename: str) -> None:
+        with open(filename) as file:
+            self.loaded.append(file.read())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_parked_file(self, filename: str) -> None:
+        with open(filename) as file:
+            self.loaded_parked.append(file.read())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _load_ignored_file(self, filename: str) -> None:
+        with open(filename) as file:
+            self.loaded_ignored.append(file.read())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _save_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        self.checkpoints.append(checkpoint)
+
+
+class LoadingBatchTestTransformer(LoadingTestTransformer, BatchTestTransformer):
+    """
+    Transformer for testing loading transformed rows while transforming rows with batch steps.
+    """
+    pass
+
+
+class OwnLoopTestTransformer(TestTransformer):
+    """
+    Transformer for testing with its own loop over the source rows.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _transform_rows(self) -> None:
+        self._find_all_step_methods()
+        for row in self._source_reader.next():
+            self._transform_row_wrapper(row)
+
+
+class TransformerTest(unittest.TestCase):
+    """
+    Test cases for Transformer.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _rows(count: int) -> List[Dict[str, Any]]:
+        """
+        Returns source rows for testing.
+
+        :param count: The number of rows.
+        """
+        rows = []
+        for i in range(count):
+            if i % 10 == 3:
+                rows.append({'name': ' ignore ', 'number': str(i)})
+            elif i % 10 == 5:
+                rows.append({'name': 'error', 'number': 'not a number'})
+            elif i % 10 == 7:
+                rows.append({'name': '', 'number': str(i)})
+            else:
+                rows.append({'name': ' row  {0:d} '.format(i), 'number': str(i)})
+
+        return rows
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _transform(self, transformer: TestTransformer) -> Dict[str, Any]:
+        """
+        Transforms all source rows and returns the results.
+
+        :param transformer: The transformer.
+        """
+        transformer.transform_source_rows()
+
+        return {'transformed': transformer._transformed_writer.rows,
+                'parked':      transformer._parked_writer.rows,
+                'ignored':     transformer._ignored_writer.rows,
+                'errors':      transformer.errors,
+                'counts':      (transformer._count_total,
+                                transformer._count_transform,
+                                transformer._count_park,
+                                transformer._count_ignore,
+                                transformer._count_error)}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_serial(self) -> None:
+        """
+        Test transforming rows in the current process.
+        """
+        results = self._transform(TestTransformer(self._rows(20), self._directory.name))
+
+        self.assertEqual({'name': 'row 0', 'square': 0}, results['transformed'][0])
+        self.assertEqual({'name': 'row 9', 'square': 81}, results['transformed'][6])
+        self.assertEqual({'name': ' ignore ', 'number': '3'}, results['ignored'][0])
+        self.assertEqual({'name': 'error', 'number': 'not a number'}, results['parked'][0])
+        self.assertEqual({'name': '', 'number': '7'}, results['parked'][1])
+        self.assertEqual([5, 15], results['errors'])
+        self.assertEqual((20, 14, 4, 2, 2), results['counts'])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_steps(self) -> None:
+        """
+        Test steps are discovered per class and are called once when transforming rows twice.
+        """
+        transformer = RowTestTransformer(self._rows(20), self._directory.name)
+        self._transform(transformer)
+        results = self._transform(transformer)
+
+        self.assertEqual(['_step00', '_step01', '_step015', '_step02', '_step99'], RowTestTransformer._get_step_names())
+        self.assertEqual(['_step00', '_step01', '_step02', '_step99'], TestTransformer._get_step_names())
+        self.assertEqual(5, len(transformer._steps))
+        self.assertEqual((40, 18, 8, 14, 4), results['counts'])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_compile_steps(self) -> None:
+        """
+        Test compiled steps give the same results as the generic loop over all steps.
+        """
+        expected = self._transform(RowTestTransformer(self._rows(100), self._directory.name))
+
+        transformer = RowTestTransformer(self._rows(100), self._directory.name)
+        transformer.compile_steps = True
+        actual = self._transform(transformer)
+
+        self.assertEqual(expected, actual)
+        self.assertIsInstance(transformer._row_transformer, types.MethodType)
+        self.assertIs(transformer._compile_steps(), transformer._row_transformer.__func__)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_compile_steps_instance_step(self) -> None:
+        """
+        Test compiled steps call a step set on the transformer instance instead of the step of the class.
+        """
+
+        def step015(in_row: Dict[str, Any], tmp_row: Dict[str, Any], out_row: Dict[str, Any]) -> Tuple[
+            Optional[str], Optional[str]]:
+            return None, 'Instance step'
+
+        expected = RowTestTransformer(self._rows(20), self._directory.name)
+        expected._step015 = step015
+        expected = self._transform(expected)
+
+        transformer = RowTestTransformer(self._rows(20), self._directory.name)
+        transformer._step015 = step015
+        transformer.compile_steps = True
+        actual = self._transform(transformer)
+
+        self.assertEqual(expected, actual)
+        self.assertEqual([], actual['transformed'])
+        self.assertIsNot(RowTestTransformer(self._rows(1), self._directory.name)._compile_steps(),
+                         transformer._row_transformer.__func__)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_copy_on_write(self) -> None:
+        """
+        Test the original rows are parked and ignored with and without copy on write rows.
+        """
+        expected = self._transform(TestTransformer(self._rows(20), self._directory.name))
+
+        transformer = TestTransformer(self._rows(20), self._directory.name)
+        transformer._source_reader.copy_on_write = False
+        actual = self._transform(transformer)
+
+        self.assertEqual(expected, actual)
+        self.assertEqual({'name': ' ignore ', 'number': '3'}, actual['ignored'][0])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_whitespace_fields(self) -> None:
+        """
+        Test whitespace is collapsed of the configured fields only and pruned of all fields by default.
+        """
+        results = self._transform(WhitespaceTestTransformer([{'name': ' spam  and\teggs ', 'number': ' 1 '}],
+                                                            self._directory.name))
+        self.assertEqual([{'name': ' spam  and\teggs ', 'square': 1}], results['transformed'])
+
+        transformer = WhitespaceTestTransformer([{'name': ' spam  and\teggs\n\xa0', 'number': ' 1 '}],
+                                                self._directory.name)
+        transformer._whitespace_fields = ['name', 'number']
+        results = self._transform(transformer)
+        self.assertEqual([{'name': 'spam and eggs', 'square': 1}], results['transformed'])
+
+        # By default, only double spaces and leading and trailing whitespace are pruned.
+        results = self._transform(TestTransformer([{'name': ' Main St  1\nApt\t2 ', 'number': ' 1 '}],
+                                                  self._directory.name))
+        self.assertEqual([{'name': 'Main St 1\nApt\t2', 'square': 1}], results['transformed'])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_load_rows(self) -> None:
+        """
+        Test loading transformed rows while transforming rows.
+        """
+        transformer = LoadingTestTransformer(self._rows(100), self._directory.name)
+        transformer.load_rows = 25
+        results = self._transform(transformer)
+
+        self.assertEqual([25, 25, 20], [len(part.splitlines()) for part in transformer.loaded])
+        self.assertEqual(''.join(repr(row) + '\n' for row in results['transformed']), ''.join(transformer.loaded))
+        self.assertTrue(os.path.exists(os.path.join(self._directory.name, 'transformed.2.csv')))
+
+        transformer = LoadingTestTransformer(self._rows(100), self._directory.name)
+        transformer.load_bytes = 1
+        results = self._transform(transformer)
+
+        self.assertEqual(1, len(transformer.loaded))
+        self.assertEqual(''.join(repr(row) + '\n' for row in results['transformed']), ''.join(transformer.loaded))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_save_checkpoint(self) -> None:
+        """
+        Test checkpoints of the source reader are saved after loading each file with transformed, parked, and ignored
+        rows.
+        """
+        transformer = LoadingTestTransformer(self._rows(100), self._directory.name)
+        transformer._source_reader.checkpoints = True
+        transformer.load_rows = 25
+        self._transform(transformer)
+
+        self.assertEqual([25, 25, 20], [len(part.splitlines()) for part in transformer.loaded])
+        self.assertEqual([{'row_number': 34}, {'row_number': 70}, {'row_number': 99}], transformer.checkpoints)
+
+        # The parked and ignored rows before each checkpoint are loaded before saving the checkpoint, the remaining
+        # parked and ignored rows are left to _load_parked_rows and _load_ignored_rows.
+        self.assertEqual([6, 8], [len(part.splitlines()) for part in transformer.loaded_parked])
+        self.assertEqual([4, 3], [len(part.splitlines()) for part in transformer.loaded_ignored])
+        with open(transformer._parked_writer.filename) as file:
+            self.assertEqual(6, len(file.read().splitlines()))
+
+        transformer = LoadingBatchTestTransformer(self._rows(100), self._directory.name)
+        transformer._source_reader.checkpoints = True
+        transformer.load_rows = 25
+        transformer.chunk_size = 10
+        results = self._transform(transformer)
+
+        self.assertEqual([27, 18], [len(part.splitlines()) for part in transformer.loaded])
+        self.assertEqual([{'row_number': 59}, {'row_number': 99}], transformer.checkpoints)
+        self.assertEqual(''.join(repr(row) + '\n' for row in results['transformed']), ''.join(transformer.loaded))
+
+        transformer = LoadingTestTransformer(self._rows(100), self._directory.name)
+        transformer.load_rows = 25
+        self._transform(transformer)
+
+        self.assertEqual([], transformer.checkpoints)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_metrics(self) -> None:
+        """
+        Test metrics are pushed to the metrics sink.
+        """
+        transformer = RowTestTransformer(self._rows(2500), self._directory.name)
+        transformer.metrics_sink = ListMetricsSink()
+        transformer.metrics_interval = 0.0
+        transformer.profile_steps = True
+        self._transform(transformer)
+
+        metrics = transformer.metrics_sink.metrics
+        self.assertEqual([1, 1001, 2001, 2500], [snapshot['count_total'] for snapshot in metrics])
+        self.assertEqual({'Ignored': 250, 'Multiple of 4': 625}, metrics[-1]['ignore_reasons'])
+        self.assertEqual({'Exception': 250, 'name': 250}, metrics[-1]['park_reasons'])
+        self.assertEqual(metrics[-1], transformer.get_metrics())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_profile_steps(self) -> None:
+        """
+        Test profiling steps with row steps, batch steps, and in worker processes.
+        """
+        expected = {'_step00':  (100, 0, 0),
+                    '_step01':  (100, 10, 10),
+                    '_step015': (80, 0, 25),
+                    '_step02':  (55, 0, 0),
+                    '_step99':  (55, 10, 0)}
+
+        transformer = RowTestTransformer(self._rows(100), self._directory.name)
+        transformer.profile_steps = True
+        self._transform(transformer)
+        profiles = transformer.get_step_profiles()
+        self.assertEqual(expected,
+                         {name: (profile['calls'], profile['parks'], profile['ignores'])
+                          for name, profile in profiles.items()})
+        self.assertGreaterEqual(profiles['_step00']['time'], profiles['_step00']['max_time'])
+
+        transformer = RowTestTransformer(self._rows(100), self._directory.name)
+        transformer.profile_steps = True
+        transformer.workers = 2
+        transformer.chunk_size = 7
+        self._transform(transformer)
+        self.assertEqual(expected,
+                         {name: (profile['calls'], profile['parks'], profile['ignores'])
+                          for name, profile in transformer.get_step_profiles().items()})
+
+        transformer = BatchTestTransformer(self._rows(100), self._directory.name)
+        transformer.profile_steps = True
+        transformer.chunk_size = 10
+        self._transform(transformer)
+        expected['_batch_step015'] = (10, 0, 25)
+        del expected['_step015']
+        self.assertEqual(expected,
+                         {name: (profile['calls'], profile['parks'], profile['ignores'])
+                          for name, profile in transformer.get_step_profiles().items()})
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_error_groups(self) -> None:
+        """
+        Test errors are grouped by exception type and origin and only the first errors are logged in detail.
+        """
+        transformer = SamplingTestTransformer(self._rows(100), self._directory.name)
+        transformer.error_detail_limit = 3
+        with self.assertLogs('etlt', 'ERROR') as logs:
+            self._transform(transformer)
+
+        self.assertEqual(3 * 4 + 1, len(logs.output))
+        self.assertIn('ERROR:etlt:Error during processing of line 25.', logs.output)
+        self.assertNotIn('ERROR:etlt:Error during processing of line 35.', logs.output)
+        self.assertEqual([10], list(transformer.get_metrics()['error_groups'].values()))
+        self.assertRegex(list(transformer.get_metrics()['error_groups'].keys())[0],
+                         r'^ValueError at .*TransformerTest.py:\d+$')
+
+        transformer = SamplingTestTransformer(self._rows(100), self._directory.name)
+        transformer.error_detail_limit = 0
+        transformer.workers = 2
+        transformer.chunk_size = 7
+        self._transform(transformer)
+
+        self.assertEqual([10], list(transformer.get_metrics()['error_groups'].values()))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_legacy_log(self) -> None:
+        """
+        Test errors are logged with _log when overridden by a child class with a single argument.
+        """
+        transformer = LegacyLogTestTransformer(self._rows(20), self._directory.name)
+        results = self._transform(transformer)
+
+        self.assertEqual((20, 14, 4, 2, 2), results['counts'])
+        self.assertIn('Error during processing of line 15.', transformer.messages)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_log_statistics(self) -> None:
+        """
+        Test logging statistics without any source rows.
+        """
+        transformer = TestTransformer([], self._directory.name)
+        self._transform(transformer)
+        transformer._time1 = transformer._time0
+        transformer._time2 = transformer._time0
+        transformer._time3 = transformer._time0
+
+        with self.assertLogs('etlt') as logs:
+            Transformer._log_statistics(transformer)
+        self.assertIn('INFO:etlt:Number of rows per second overall   : 0', logs.output)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_log_statistics_stdout(self) -> None:
+        """
+        Test the statistics are printed on stdout when logging has not been configured.
+        """
+        transformer = TestTransformer(self._rows(20), self._directory.name)
+        self._transform(transformer)
+
+        stdout = io.StringIO()
+        with unittest.mock.patch.object(logging.Logger, 'hasHandlers', return_value=False), \
+                contextlib.redirect_stdout(stdout):
+            Transformer._log_statistics(transformer)
+        self.assertIn('Number of rows processed            : 20', stdout.getvalue())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_parallel(self) -> None:
+        """
+        Test transforming rows with worker processes gives the same results as transforming rows in the current process.
+        """
+        expected = self._transform(TestTransformer(self._rows(1000), self._directory.name))
+
+        transformer = TestTransformer(self._rows(1000), self._directory.name)
+        transformer.workers = 3
+        transformer.chunk_size = 7
+        actual = self._transform(transformer)
+
+        self.assertEqual(expected['transformed'], actual['transformed'])
+        self.assertEqual(expected['parked'], actual['parked'])
+        self.assertEqual(expected['ignored'], actual['ignored'])
+        self.assertEqual(expected['counts'], actual['counts'])
+
+        # _handle_exception runs in the worker processes: its side effects are lost, only the error counts are returned
+        # to the current process.
+        self.assertEqual(list(range(5, 1000, 10)), expected['errors'])
+        self.assertEqual([], actual['errors'])
+        self.assertEqual(expected['counts'][4], actual['counts'][4])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_parallel_without_fork(self) -> None:
+        """
+        Test transforming rows with worker processes raises a clear error when the fork start method is not available.
+        """
+        transformer = TestTransformer(self._rows(20), self._directory.name)
+        transformer.workers = 3
+        with unittest.mock.patch('multiprocessing.get_all_start_methods', return_value=['spawn']):
+            with self.assertRaisesRegex(RuntimeError, 'fork'):
+                transformer.transform_source_rows()
+
+        self.assertEqual([], transformer._transformed_writer.rows)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_error_row_number(self) -> None:
+        """
+        Test the row number of an exception is reported by a transformer with its own loop over the source rows.
+        """
+        transformer = OwnLoopTestTransformer(self._rows(20), self._directory.name)
+        results = self._transform(transformer)
+
+        self.assertEqual([5, 15], results['errors'])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_pipeline(self) -> None:
+        """
+        Test transforming rows in a pipeline gives the same results as transforming rows in the current thread.
+        """
+        expected = self._transform(TestTransformer(self._rows(1000), self._directory.name))
+
+        transformer = TestTransformer(self._rows(1000), self._directory.name)
+        transformer.pipeline = True
+        transformer.pipeline_queue_size = 2
+        transformer.chunk_size = 7
+        actual = self._transform(transformer)
+
+        self.assertEqual(expected, actual)
+
+        statistics = transformer.get_metrics()['pipeline']
+        self.assertEqual(['read', 'transform', 'write'], list(statistics['stalls'].keys()))
+        self.assertLessEqual(statistics['read_queue']['max_depth'], 2)
+        self.assertEqual(0, statistics['write_queue']['depth'])
+
+        self.assertIsNone(TestTransformer(self._rows(10), self._directory.name).get_pipeline_statistics())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_pipeline_load_rows(self) -> None:
+        """
+        Test loading transformed rows while transforming rows in a pipeline.
+        """
+        transformer = LoadingTestTransformer(self._rows(100), self._directory.name)
+        transformer._source_reader.checkpoints = True
+        transformer.pipeline = True
+        transformer.load_rows = 25
+        transformer.chunk_size = 10
+        results = self._transform(transformer)
+
+        self.assertEqual([28, 28, 14], [len(part.splitlines()) for part in transformer.loaded])
+        self.assertEqual([{'row_number': 39}, {'row_number': 79}, {'row_number': 99}], transformer.checkpoints)
+        self.assertEqual(''.join(repr(row) + '\n' for row in results['transformed']), ''.join(transformer.loaded))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_pipeline_exceptions(self) -> None:
+        """
+        Test exceptions raised by the reader and writer threads of the pipeline are reraised.
+        """
+        rows = self._rows(100)
+        rows[50] = None
+
+        transformer = TestTransformer(rows, self._directory.name)
+        transformer.pipeline = True
+        transformer.chunk_size = 10
+        with self.assertRaises(TypeError):
+            transformer.transform_source_rows()
+
+        transformer = TestTransformer(self._rows(100), self._directory.name)
+        transformer.pipeline = True
+        transformer.chunk_size = 10
+
+        def writerow(row: Dict[str, Any]) -> None:
+            raise OSError('Disk full')
+
+        transformer._parked_writer.writerow = writerow
+        with self.assertRaises(OSError):
+            transformer.transform_source_rows()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_batch_steps(self) -> None:
+        """
+        Test batch steps give the same results as the equivalent row steps.
+        """
+        expected = self._transform(RowTestTransformer(self._rows(100), self._directory.name))
+
+        transformer = BatchTestTransformer(self._rows(100), self._directory.name)
+        transformer.chunk_size = 7
+        actual = self._transform(transformer)
+
+        self.assertEqual(expected, actual)
+        self.assertEqual({'name': ' row  4 ', 'number': '4'}, actual['ignored'][2])
+
+        transformer = BatchTestTransformer(self._rows(100), self._directory.name)
+        transformer.workers = 2
+        transformer.chunk_size = 7
+        actual = self._transform(transformer)
+
+        self.assertEqual(expected['transformed'], actual['transformed'])
+        self.assertEqual(expected['parked'], actual['parked'])
+        self.assertEqual(expected['ignored'], actual['ignored'])
+        self.assertEqual(expected['counts'], actual['counts'])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_batch_step_too_few_results(self) -> None:
+        """
+        Test all rows passed to a batch step returning too few results are parked.
+        """
+        transformer = ShortBatchTestTransformer(self._rows(10), self._directory.name)
+        transformer.chunk_size = 5
+        results = self._transform(transformer)
+
+        self.assertEqual([], results['transformed'])
+        self.assertEqual([0, 1, 2, 4, 5, 6, 7, 8, 9], results['errors'])
+        self.assertEqual((10, 0, 9, 1, 9), results['counts'])
+
+# ----------------------------------------------------------------------------------------------------------------------
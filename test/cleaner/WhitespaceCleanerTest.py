@@ -0,0 +1,45 @@
+import unittest
+
+from etlt.cleaner.WhitespaceCleaner import WhitespaceCleaner
+
+
+class WhitespaceCleanerTest(unittest.TestCase):
+    # ------------------------------------------------------------------------------------------------------------------
+    def _test(self, expected: str, dirty: str) -> None:
+        clean = WhitespaceCleaner.collapse(dirty)
+        self.assertEqual(expected, clean)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test00(self) -> None:
+        """
+        Tests with empty and clean strings.
+        """
+        self._test(None, None)
+        self._test('', '')
+        self._test('spam', 'spam')
+        self._test('spam and eggs', 'spam and eggs')
+
+        clean = 'spam and eggs'
+        self.assertIs(clean, WhitespaceCleaner.collapse(clean))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test01(self) -> None:
+        """
+        Tests with leading and trailing whitespace.
+        """
+        self._test('spam', ' spam')
+        self._test('spam', 'spam ')
+        self._test('spam', '\tspam\n')
+        self._test('', ' ')
+        self._test('', ' \t ')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test02(self) -> None:
+        """
+        Tests with runs of whitespace.
+        """
+        self._test('spam and eggs', 'spam  and    eggs')
+        self._test('spam and eggs', 'spam\tand\r\neggs')
+        self._test('spam and eggs', '  spam \t and eggs  ')
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,83 @@
+import asyncio
+import unittest
+from typing import Any, List, Optional
+
+from etlt.dimension.AsyncRegularDimension import AsyncRegularDimension
+
+
+class TestDimension(AsyncRegularDimension):
+    """
+    Dimension with an artificial latency of the stored procedure.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, concurrency: int):
+        AsyncRegularDimension.__init__(self, concurrency)
+
+        self.calls: List[Any] = []
+        self.active: int = 0
+        self.max_active: int = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def call_stored_procedure(self, natural_key: Any, enhancement: Any) -> Optional[int]:
+        self.calls.append(natural_key)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if natural_key < 0:
+                raise ValueError(natural_key)
+        finally:
+            self.active -= 1
+
+        return natural_key * 10 if natural_key else None
+
+
+class AsyncRegularDimensionTest(unittest.TestCase):
+    """
+    Test cases for AsyncRegularDimension.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_get_id(self) -> None:
+        """
+        Test concurrent lookups share calls of the stored procedure and the number of concurrent calls is limited.
+        """
+
+        async def get_ids() -> List[Optional[int]]:
+            return await asyncio.gather(*(dimension.get_id(key) for key in keys))
+
+        dimension = TestDimension(3)
+        keys = [1, 2, 1, 3, 0, 4, 5, 2, 6, 0]
+
+        self.assertEqual([10, 20, 10, 30, None, 40, 50, 20, 60, None], asyncio.run(get_ids()))
+        self.assertEqual([1, 2, 3, 0, 4, 5, 6], dimension.calls)
+        self.assertEqual(3, dimension.max_active)
+
+        # Known keys, including invalid keys, are not looked up again, also not in another event loop.
+        self.assertEqual([10, 20, 10, 30, None, 40, 50, 20, 60, None], asyncio.run(get_ids()))
+        self.assertEqual(7, len(dimension.calls))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_exception(self) -> None:
+        """
+        Test an exception of the stored procedure is raised in all concurrent lookups and is not cached.
+        """
+
+        async def get_ids() -> List[Any]:
+            return await asyncio.gather(dimension.get_id(-1), dimension.get_id(-1), dimension.get_id(1),
+                                        return_exceptions=True)
+
+        dimension = TestDimension(3)
+        results = asyncio.run(get_ids())
+
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(10, results[2])
+        self.assertEqual([-1, 1], dimension.calls)
+        self.assertEqual({}, dimension._pending)
+
+        asyncio.run(get_ids())
+        self.assertEqual([-1, 1, -1], dimension.calls)
+
+# ----------------------------------------------------------------------------------------------------------------------
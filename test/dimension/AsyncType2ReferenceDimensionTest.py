@@ -0,0 +1,72 @@
+import asyncio
+import datetime
+import unittest
+from typing import Any, Dict, List, Optional
+
+from etlt.dimension.AsyncType2ReferenceDimension import AsyncType2ReferenceDimension
+
+
+class TestDimension(AsyncType2ReferenceDimension):
+    """
+    Type2 reference dimension with an artificial latency of the stored procedure.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self):
+        AsyncType2ReferenceDimension.__init__(self, 2)
+
+        self._key_key = 'id'
+        self._key_date_start = 'start'
+        self._key_date_end = 'end'
+
+        self.calls: List[Any] = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    async def call_stored_procedure(self, natural_key: Any, date: str, enhancement: Any) -> Dict[str, Any]:
+        self.calls.append((natural_key, date))
+        await asyncio.sleep(0.01)
+        if natural_key == 'unknown':
+            return {'id': None, 'start': None, 'end': None}
+
+        year = int(date[:4])
+
+        return {'id': year,
+                'start': datetime.date(year, 1, 1),
+                'end':   datetime.date(year, 12, 31)}
+
+
+class AsyncType2ReferenceDimensionTest(unittest.TestCase):
+    """
+    Test cases for AsyncType2ReferenceDimension.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_get_id(self) -> None:
+        """
+        Test concurrent lookups of the same natural key wait for the call of the stored procedure in flight and call the
+        stored procedure only if their date has not been loaded by that call.
+        """
+
+        async def get_ids() -> List[Optional[int]]:
+            return await asyncio.gather(*(dimension.get_id(key, date) for key, date in keys))
+
+        dimension = TestDimension()
+        keys = [('a', '2020-03-01'),
+                ('a', '2020-03-01'),
+                ('a', '2021-03-01'),
+                ('a', '2020-06-01'),
+                ('unknown', '2020-03-01'),
+                ('a', ''),
+                ('unknown', '2020-03-01')]
+
+        self.assertEqual([2020, 2020, 2021, 2020, None, None, None], asyncio.run(get_ids()))
+        self.assertEqual([('a', '2020-03-01'), ('unknown', '2020-03-01'), ('a', '2021-03-01')], dimension.calls)
+        self.assertEqual([('2020-01-01', '2020-12-31', 2020), ('2021-01-01', '2021-12-31', 2021)], dimension._map['a'])
+
+        async def get_id() -> Optional[int]:
+            return await dimension.get_id('a', '2020-12-31')
+
+        self.assertEqual(2020, asyncio.run(get_id()))
+        self.assertEqual(3, len(dimension.calls))
+
+# ----------------------------------------------------------------------------------------------------------------------
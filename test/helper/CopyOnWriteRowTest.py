@@ -0,0 +1,58 @@
+import copy
+import pickle
+import unittest
+
+from etlt.helper.CopyOnWriteRow import CopyOnWriteRow
+
+
+class CopyOnWriteRowTest(unittest.TestCase):
+    """
+    Test cases for CopyOnWriteRow.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_unmodified(self) -> None:
+        """
+        Test the original of an unmodified row is the row itself.
+        """
+        row = CopyOnWriteRow({'a': 1, 'b': 2})
+        self.assertEqual(1, row['a'])
+        self.assertIs(row, row.original())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_modified(self) -> None:
+        """
+        Test the original of a modified row.
+        """
+        row = CopyOnWriteRow({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5})
+        row['a'] = 10
+        row['a'] = 100
+        del row['b']
+        row.pop('c')
+        row.update({'d': 40, 'f': 60})
+        row.setdefault('g', 70)
+        row |= {'e': 50}
+
+        self.assertEqual({'a': 100, 'd': 40, 'e': 50, 'f': 60, 'g': 70}, row)
+        self.assertEqual({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5}, row.original())
+
+        row.clear()
+        self.assertEqual({}, row)
+        self.assertEqual({'a': 1, 'b': 2, 'c': 3, 'd': 4, 'e': 5}, row.original())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_copy(self) -> None:
+        """
+        Test copies of a row.
+        """
+        row = CopyOnWriteRow({'a': 1, 'b': 2})
+        row['a'] = 10
+
+        for other in (copy.copy(row), pickle.loads(pickle.dumps(row))):
+            self.assertIsInstance(other, CopyOnWriteRow)
+            self.assertEqual({'a': 10, 'b': 2}, other)
+            other['b'] = 20
+            self.assertEqual({'a': 10, 'b': 2}, other.original())
+            self.assertEqual({'a': 10, 'b': 2}, row)
+
+# ----------------------------------------------------------------------------------------------------------------------
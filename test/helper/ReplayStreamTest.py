@@ -0,0 +1,40 @@
+import io
+import unittest
+
+from etlt.helper.ReplayStream import ReplayStream
+
+
+class ReplayStreamTest(unittest.TestCase):
+    """
+    Test cases for ReplayStream.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_replay(self) -> None:
+        """
+        Test the head is replayed before the remainder of the stream.
+        """
+        stream = io.BytesIO(b'0123456789')
+        head = stream.read(4)
+        replay = ReplayStream(head, stream)
+
+        self.assertEqual(b'01', replay.read(2))
+        self.assertEqual(b'23', replay.read(5))
+        self.assertEqual(b'456789', replay.read())
+        self.assertEqual(b'', replay.read())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_text(self) -> None:
+        """
+        Test reading lines through a buffered text stream.
+        """
+        stream = io.BytesIO('aé\r\nb\nc'.encode('utf-8'))
+        head = stream.read(2)
+        text = io.TextIOWrapper(io.BufferedReader(ReplayStream(head, stream)), encoding='utf-8')
+
+        self.assertEqual(['aé\n', 'b\n', 'c'], text.readlines())
+
+        text.close()
+        self.assertTrue(stream.closed)
+
+# ----------------------------------------------------------------------------------------------------------------------
@@ -0,0 +1,61 @@
+import codecs
+import unittest
+from unittest import mock
+
+from etlt.reader.EncodingDetector import EncodingDetector
+
+
+class EncodingDetectorTest(unittest.TestCase):
+    """
+    Test cases for EncodingDetector.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_bom(self) -> None:
+        """
+        Test detection by byte order marks.
+        """
+        detector = EncodingDetector()
+
+        self.assertEqual('utf-8-sig', detector.detect(codecs.BOM_UTF8 + b'a,b\n'))
+        self.assertEqual('utf-16', detector.detect('a,b\n'.encode('utf-16')))
+        self.assertEqual('utf-32', detector.detect('a,b\n'.encode('utf-32')))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_utf8(self) -> None:
+        """
+        Test valid UTF-8 is detected without chardet, also when the sample ends in an incomplete character.
+        """
+        detector = EncodingDetector()
+        sample = 'naïve,café\n'.encode('utf-8') * 10 + 'é'.encode('utf-8')[:1]
+
+        with mock.patch('chardet.detect') as detect:
+            self.assertEqual('utf-8', detector.detect(sample))
+        detect.assert_not_called()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_chardet(self) -> None:
+        """
+        Test chardet is the last resort, both in normal and incremental mode.
+        """
+        sample = 'café,crème\n'.encode('latin-1') * 10
+
+        with mock.patch('chardet.detect', return_value={'encoding': 'ISO-8859-1'}) as detect:
+            detector = EncodingDetector(use_fast_detector=False)
+            self.assertEqual('ISO-8859-1', detector.detect(sample))
+        detect.assert_called_once_with(sample)
+
+        detector = EncodingDetector(use_fast_detector=False, incremental=True, chunk_size=16)
+        self.assertIsNotNone(detector.detect(sample))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_empty(self) -> None:
+        """
+        Test detection of an empty sample.
+        """
+        detector = EncodingDetector(use_fast_detector=False)
+
+        self.assertIsNone(detector._detect_utf8(b''))
+        detector.detect(b'')
+
+# ----------------------------------------------------------------------------------------------------------------------
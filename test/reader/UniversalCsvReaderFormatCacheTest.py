@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+
+from etlt.reader.UniversalCsvReaderFormatCache import UniversalCsvReaderFormatCache
+
+
+class UniversalCsvReaderFormatCacheTest(unittest.TestCase):
+    """
+    Test cases for UniversalCsvReaderFormatCache.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def setUp(self) -> None:
+        """
+        Creates a temporary directory for the cache file.
+        """
+        self._directory = tempfile.TemporaryDirectory()
+        self._filename = os.path.join(self._directory.name, 'cache.json')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def tearDown(self) -> None:
+        """
+        Removes the temporary directory.
+        """
+        self._directory.cleanup()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_signature(self) -> None:
+        """
+        Test files with the same name pattern and header have the same signature.
+        """
+        cache = UniversalCsvReaderFormatCache(self._filename)
+
+        signature1 = cache.signature('/in/orders-20260101.csv', b'id,name\n1,a\n')
+        signature2 = cache.signature('/in/orders-20260102.csv', b'id,name\n2,b\n')
+        signature3 = cache.signature('/in/orders-20260102.csv', b'id;name\n2;b\n')
+
+        self.assertEqual(signature1, signature2)
+        self.assertNotEqual(signature1, signature3)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_persistence(self) -> None:
+        """
+        Test the cache is stored and loaded.
+        """
+        cache = UniversalCsvReaderFormatCache(self._filename)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', {'encoding': 'utf-8', 'delimiter': ','})
+
+        cache = UniversalCsvReaderFormatCache(self._filename)
+        self.assertEqual({'encoding': 'utf-8', 'delimiter': ','}, cache.get('a'))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_lru(self) -> None:
+        """
+        Test the least recently used entries are evicted.
+        """
+        cache = UniversalCsvReaderFormatCache(self._filename, 2)
+        cache.put('a', {'delimiter': ','})
+        cache.put('b', {'delimiter': ';'})
+        cache.get('a')
+        cache.put('c', {'delimiter': '|'})
+
+        with open(self._filename, 'rt', encoding='utf-8') as file:
+            entries = json.load(file)
+
+        self.assertEqual(['a', 'c'], list(entries.keys()))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_corrupt(self) -> None:
+        """
+        Test a corrupt cache file is ignored.
+        """
+        with open(self._filename, 'wt', encoding='utf-8') as file:
+            file.write('{')
+
+        cache = UniversalCsvReaderFormatCache(self._filename)
+        self.assertIsNone(cache.get('a'))
+
+# ----------------------------------------------------------------------------------------------------------------------
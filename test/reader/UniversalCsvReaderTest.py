@@ -0,0 +1,430 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+from typing import List
+from unittest import mock
+
+from etlt.helper.CopyOnWriteRow import CopyOnWriteRow
+from etlt.reader import UniversalCsvReader as UniversalCsvReaderModule
+from etlt.reader.UniversalCsvReader import UniversalCsvReader
+from etlt.reader.UniversalCsvReaderFormatCache import UniversalCsvReaderFormatCache
+
+
+class UniversalCsvReaderTest(unittest.TestCase):
+    """
+    Test cases for UniversalCsvReader.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def setUp(self) -> None:
+        """
+        Creates a temporary directory for the CSV files.
+        """
+        self._directory = tempfile.TemporaryDirectory()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def tearDown(self) -> None:
+        """
+        Removes the temporary directory.
+        """
+        self._directory.cleanup()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _write_file(self, name: str, data: str, encoding: str = 'utf-8') -> str:
+        """
+        Writes a CSV file in the temporary directory and returns its path.
+
+        :param name: The name of the file.
+        :param data: The content of the file.
+        :param encoding: The encoding of the file.
+        """
+        filename = os.path.join(self._directory.name, name)
+        with open(filename, 'wt', encoding=encoding, newline='') as file:
+            file.write(data)
+
+        return filename
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _read(self, reader: UniversalCsvReader) -> List:
+        """
+        Returns all rows of a reader.
+
+        :param reader: The reader.
+        """
+        with reader:
+            return list(reader.next())
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_plain(self) -> None:
+        """
+        Test reading rows without mapping or fields.
+        """
+        filename = self._write_file('plain.csv', 'a,b,c\n1,2,3\n')
+        reader = UniversalCsvReader([filename])
+
+        self.assertEqual([['a', 'b', 'c'], ['1', '2', '3']], self._read(reader))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_mapping(self) -> None:
+        """
+        Test reading rows with a mapping, including short rows and out of range column numbers.
+        """
+        filename = self._write_file('mapping.csv', '1,2,3\n4\n')
+        reader = UniversalCsvReader([filename])
+        reader.mapping = {'c': 2, 'a': 0}
+
+        self.assertEqual([{'c': '3', 'a': '1'}, {'c': '', 'a': '4'}], self._read(reader))
+
+        reader.mapping = {'a': 0, 'x': -1}
+        self.assertEqual([{'a': '1', 'x': ''}, {'a': '4', 'x': ''}], self._read(reader))
+
+        reader.mapping = {'b': 1}
+        self.assertEqual([{'b': '2'}, {'b': ''}], self._read(reader))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_projection(self) -> None:
+        """
+        Test only the columns in the mapping are split from unquoted lines and quoted lines are parsed fully.
+        """
+        filename = self._write_file('wide.csv', 'a,b,c,d,e\r\n"x\r\ny",2,3,4,5\n\nf,g\n1,2,"3,3",4\n1,\\,2')
+        reader = UniversalCsvReader([filename])
+        reader.mapping = {'c': 2, 'a': 0}
+
+        self.assertEqual([{'c': 'c', 'a': 'a'},
+                          {'c': '3', 'a': 'x\ny'},
+                          {'c': '', 'a': ''},
+                          {'c': '', 'a': 'f'},
+                          {'c': '3,3', 'a': '1'},
+                          {'c': '', 'a': '1'}], self._read(reader))
+
+        with mock.patch.object(UniversalCsvReader, '_get_projection', return_value=None):
+            self.assertEqual([{'c': 'c', 'a': 'a'},
+                              {'c': '3', 'a': 'x\ny'},
+                              {'c': '', 'a': ''},
+                              {'c': '', 'a': 'f'},
+                              {'c': '3,3', 'a': '1'},
+                              {'c': '', 'a': '1'}], self._read(reader))
+
+        reader._filename = filename
+        reader._open()
+        self.assertEqual(['a', 'b', 'c', 'd,e'], next(reader._split_rows(3)))
+        reader._close()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_fields(self) -> None:
+        """
+        Test reading rows with fields, including short and long rows.
+        """
+        filename = self._write_file('fields.csv', '1,2\n3\n4,5,6\n')
+        reader = UniversalCsvReader([filename])
+        reader.fields = ['a', 'b']
+
+        self.assertEqual([{'a': '1', 'b': '2'}, {'a': '3', 'b': ''}, {'a': '4', 'b': '5', '': '6'}],
+                         self._read(reader))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_copy_on_write(self) -> None:
+        """
+        Test reading rows as copy-on-write rows.
+        """
+        filename = self._write_file('cow.csv', '1,2\n')
+        reader = UniversalCsvReader([filename])
+        reader.fields = ['a', 'b']
+        reader.copy_on_write = True
+
+        rows = self._read(reader)
+        self.assertIsInstance(rows[0], CopyOnWriteRow)
+        self.assertEqual({'a': '1', 'b': '2'}, rows[0])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_row_type(self) -> None:
+        """
+        Test reading rows as tuples and named tuples.
+        """
+        filename = self._write_file('row_type.csv', '1,2,3\n4\n')
+        reader = UniversalCsvReader([filename])
+        reader.mapping = {'c': 2, 'a': 0}
+
+        reader.row_type = 'tuple'
+        self.assertEqual([('3', '1'), ('', '4')], self._read(reader))
+
+        reader.row_type = 'namedtuple'
+        rows = self._read(reader)
+        self.assertEqual(('3', '1'), rows[0])
+        self.assertEqual('4', rows[1].a)
+        self.assertEqual('', rows[1].c)
+
+        reader.mapping = None
+        reader.fields = ['a', 'b']
+        reader.row_type = 'tuple'
+        self.assertEqual([('1', '2'), ('4', '')], self._read(reader))
+
+        with self.assertRaises(ValueError):
+            reader.row_type = 'list'
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_detect_format(self) -> None:
+        """
+        Test auto-detecting the encoding and the delimiter of a file.
+        """
+        filename = self._write_file('utf8.csv', 'naïve;café;crème\r\nx;y;z\r\n' * 100)
+        reader = UniversalCsvReader([filename])
+
+        rows = self._read(reader)
+        self.assertEqual(200, len(rows))
+        self.assertEqual(['naïve', 'café', 'crème'], rows[0])
+        self.assertEqual(['x', 'y', 'z'], rows[199])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_bz2(self) -> None:
+        """
+        Test reading a bz2 compressed file larger than the sample size.
+        """
+        filename = os.path.join(self._directory.name, 'large.csv.bz2')
+        with bz2.open(filename, 'wt', encoding='utf-8') as file:
+            for i in range(20000):
+                file.write('{0}\t{1}\n'.format(i, i * i))
+
+        reader = UniversalCsvReader([filename])
+        reader.fields = ['number', 'square']
+
+        rows = self._read(reader)
+        self.assertEqual(20000, len(rows))
+        self.assertEqual({'number': '0', 'square': '0'}, rows[0])
+        self.assertEqual({'number': '19999', 'square': str(19999 * 19999)}, rows[19999])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_compression(self) -> None:
+        """
+        Test reading gz and xz compressed files, independent of the extension of the files.
+        """
+        for name, module in (('file.csv.gz', gzip), ('file.xz', lzma), ('file.csv', gzip), ('file.dat', bz2)):
+            with self.subTest(name=name):
+                filename = os.path.join(self._directory.name, name)
+                with module.open(filename, 'wt', encoding='utf-8') as file:
+                    file.write('a,b\n1,2\n')
+
+                reader = UniversalCsvReader([filename])
+                self.assertEqual([['a', 'b'], ['1', '2']], self._read(reader))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_plain_text_like_bz2(self) -> None:
+        """
+        Test that an uncompressed file starting with "BZh" is not mistaken for a bz2 compressed file, while an empty
+        bz2 compressed file is detected.
+        """
+        filename = self._write_file('file.csv', 'BZh9,b\n1,2\n')
+        reader = UniversalCsvReader([filename])
+        self.assertEqual([['BZh9', 'b'], ['1', '2']], self._read(reader))
+
+        filename = os.path.join(self._directory.name, 'empty.csv.bz2')
+        with open(filename, 'wb') as file:
+            file.write(bz2.compress(b''))
+
+        reader = UniversalCsvReader([filename])
+        self.assertEqual([], self._read(reader))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @unittest.skipIf(UniversalCsvReaderModule.zstandard is None, 'zstandard is not installed')
+    def test_zstd(self) -> None:
+        """
+        Test reading a zstd compressed file.
+        """
+        filename = os.path.join(self._directory.name, 'file.zst')
+        with open(filename, 'wb') as file:
+            file.write(UniversalCsvReaderModule.zstandard.ZstdCompressor().compress(b'a,b\n1,2\n'))
+
+        reader = UniversalCsvReader([filename])
+        self.assertEqual([['a', 'b'], ['1', '2']], self._read(reader))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_zstd_not_installed(self) -> None:
+        """
+        Test reading a zstd compressed file without the zstandard module.
+        """
+        filename = os.path.join(self._directory.name, 'file.zst')
+        with open(filename, 'wb') as file:
+            file.write(b'\x28\xb5\x2f\xfd\x00\x00\x00\x00')
+
+        reader = UniversalCsvReader([filename])
+        with mock.patch.object(UniversalCsvReaderModule, 'zstandard', None), self.assertRaises(ValueError):
+            self._read(reader)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_format_cache(self) -> None:
+        """
+        Test detected formatting parameters are reused for files with the same signature.
+        """
+        filename1 = self._write_file('data-1.csv', 'a;b\n1;2\n')
+        filename2 = self._write_file('data-2.csv', 'a;b\n3;4\n')
+        cache = UniversalCsvReaderFormatCache(os.path.join(self._directory.name, 'cache.json'))
+
+        reader = UniversalCsvReader([filename1], format_cache=cache)
+        self.assertEqual([['a', 'b'], ['1', '2']], self._read(reader))
+
+        reader = UniversalCsvReader([filename2], format_cache=cache)
+        with mock.patch.object(UniversalCsvReader, '_detect_encoding') as detect_encoding, \
+                mock.patch.object(UniversalCsvReader, '_detect_delimiter') as detect_delimiter:
+            self.assertEqual([['a', 'b'], ['3', '4']], self._read(reader))
+        detect_encoding.assert_not_called()
+        detect_delimiter.assert_not_called()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_multiple_files(self) -> None:
+        """
+        Test reading multiple files and the row number and source name.
+        """
+        filename1 = self._write_file('file1.csv', '1\n2\n')
+        filename2 = self._write_file('file2.csv', '3\n')
+        reader = UniversalCsvReader([filename1, filename2])
+        reader.fields = ['a']
+
+        sources = []
+        with reader:
+            for row in reader.next():
+                sources.append((reader.get_source_name(), reader.row_number, row['a']))
+
+        self.assertEqual([(filename1, 0, '1'), (filename1, 1, '2'), (filename2, 0, '3')], sources)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_memory_map(self) -> None:
+        """
+        Test reading through a memory map yields the same rows as reading through the text I/O layer.
+        """
+        data = ''.join('{0},"é\r\n{0}"\r\n{0},x\r\n'.format(i) for i in range(500))
+        filenames = [self._write_file('crlf.csv', data),
+                     self._write_file('bom.csv', '\ufeff' + data.replace('\r\n', '\n')),
+                     self._write_file('cr.csv', data.replace('\r\n', '\r')),
+                     self._write_file('empty.csv', ''),
+                     self._write_file('utf16.csv', data, 'utf-16')]
+
+        for filename in filenames:
+            with self.subTest(filename=os.path.basename(filename)):
+                results = []
+                for memory_map in (False, True):
+                    reader = UniversalCsvReader([filename])
+                    reader.memory_map = memory_map
+                    with mock.patch.object(UniversalCsvReader, 'buffer_size', 100):
+                        results.append(self._read(reader))
+
+                self.assertEqual(results[0], results[1])
+
+        self.assertEqual(['7', 'é\n7'], results[0][14])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_checkpoint(self) -> None:
+        """
+        Test resuming reading from checkpoints yields the remaining rows for uncompressed, compressed, and untracked
+        files.
+        """
+        data = ''.join('{0},"a\r\nb {0}",é\r\n'.format(i) for i in range(20))
+        filenames = [self._write_file('plain.csv', data), self._write_file('utf16.csv', data, 'utf-16')]
+        filename = os.path.join(self._directory.name, 'gz.csv.gz')
+        with gzip.open(filename, 'wt', encoding='utf-8', newline='') as file:
+            file.write(data)
+        filenames.append(filename)
+
+        reader = UniversalCsvReader(filenames)
+        reader.checkpoints = True
+        self.assertEqual({'file_index': 0, 'filename': filenames[0], 'offset': 0, 'row_number': -1},
+                         reader.get_checkpoint())
+
+        rows = []
+        checkpoints = []
+        with reader:
+            for row in reader.next():
+                rows.append((reader.get_source_name(), reader.row_number, row))
+                checkpoints.append(reader.get_checkpoint())
+        self.assertEqual(60, len(rows))
+        self.assertEqual({'file_index': 3, 'filename': None, 'offset': 0, 'row_number': -1}, reader.get_checkpoint())
+        self.assertIsNone(checkpoints[25]['offset'])
+        self.assertIsNotNone(checkpoints[45]['offset'])
+
+        for index in (0, 7, 19, 25, 39, 45, 59):
+            with self.subTest(index=index):
+                reader = UniversalCsvReader(filenames)
+                reader.checkpoints = True
+                reader.resume(checkpoints[index])
+                resumed = []
+                with reader:
+                    for row in reader.next():
+                        resumed.append((reader.get_source_name(), reader.row_number, row))
+                self.assertEqual(rows[index + 1:], resumed)
+
+        reader = UniversalCsvReader(filenames[1:])
+        with self.assertRaises(ValueError):
+            reader.resume(checkpoints[0])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_checkpoint_bare_cr(self) -> None:
+        """
+        Test a bare CR in a file with LF line endings ends a line when keeping track of checkpoints, like when reading
+        without checkpoints, and resuming after that line yields the remaining rows.
+        """
+        filename = self._write_file('bare_cr.csv', 'a,b\nc\rd,e\nf,g\n')
+        expected = [['a', 'b'], ['c'], ['d', 'e'], ['f', 'g']]
+        self.assertEqual(expected, self._read(UniversalCsvReader([filename])))
+
+        reader = UniversalCsvReader([filename])
+        reader.checkpoints = True
+        rows = []
+        checkpoints = []
+        with reader:
+            for row in reader.next():
+                rows.append(row)
+                checkpoints.append(reader.get_checkpoint())
+        self.assertEqual(expected, rows)
+        self.assertEqual([4, 6, 10, 14], [checkpoint['offset'] for checkpoint in checkpoints])
+
+        reader = UniversalCsvReader([filename])
+        reader.checkpoints = True
+        reader.resume(checkpoints[1])
+        self.assertEqual(expected[2:], self._read(reader))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_prefetch(self) -> None:
+        """
+        Test reading multiple files with prefetching yields the same rows, row numbers, and source names as reading
+        the files one after another.
+        """
+        filenames = []
+        for i in range(6):
+            lines = ''.join('{0},{1}\n'.format(i, j) for j in range(i * 1000))
+            filenames.append(self._write_file('file{0}.csv'.format(i), lines))
+
+        results = []
+        for prefetch in (0, 2):
+            reader = UniversalCsvReader(filenames)
+            reader.fields = ['file', 'line']
+            reader.prefetch = prefetch
+
+            sources = []
+            with reader:
+                for row in reader.next():
+                    sources.append((reader.get_source_name(), reader.row_number, row['file'], row['line']))
+            results.append(sources)
+
+        self.assertEqual(15000, len(results[0]))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual((filenames[5], 4999, '5', '4999'), results[1][-1])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_prefetch_error(self) -> None:
+        """
+        Test errors while prefetching are raised in order and stopping early does not block.
+        """
+        filename = self._write_file('file.csv', '1\n' * 50000)
+        reader = UniversalCsvReader([filename, os.path.join(self._directory.name, 'missing.csv')])
+        reader.prefetch = 1
+
+        rows = reader.next()
+        self.assertEqual(['1'], next(rows))
+        rows.close()
+
+        with self.assertRaises(FileNotFoundError):
+            self.assertEqual(50000, sum(1 for _ in reader.next()))
+
+# ----------------------------------------------------------------------------------------------------------------------
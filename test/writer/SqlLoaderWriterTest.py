@@ -0,0 +1,207 @@
+import datetime
+import os
+import tempfile
+import unittest
+from typing import Any, Dict, Optional
+
+from etlt.writer.SqlLoaderWriter import SqlLoaderWriter
+
+
+class TestWriter(SqlLoaderWriter):
+    """
+    Writer for writing rows as tab separated values.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __init__(self, filename: str):
+        SqlLoaderWriter.__init__(self, filename)
+
+        self.writes: int = 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def __enter__(self):
+        SqlLoaderWriter.__enter__(self)
+        write = self._file.write
+
+        def counting_write(text: str) -> int:
+            self.writes += 1
+            return write(text)
+
+        self._file.write = counting_write
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerow(self, row: Dict[str, Any]) -> None:
+        for index, field in enumerate(self._fields):
+            if index:
+                self._file.write('\t')
+            self._write_field(row[field])
+        self._file.write('\n')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_bulk_load_sql(self, table_name: str, partition: Optional[str] = None) -> str:
+        return ''
+
+
+class SerializingTestWriter(SqlLoaderWriter):
+    """
+    Writer for writing rows as tab separated values with a row serializer.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def writerow(self, row: Dict[str, Any]) -> None:
+        self._write_row(row, '\t', '\n')
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def get_bulk_load_sql(self, table_name: str, partition: Optional[str] = None) -> str:
+        return ''
+
+
+class SqlLoaderWriterTest(unittest.TestCase):
+    """
+    Test cases for SqlLoaderWriter.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self._handlers = dict(SqlLoaderWriter.handlers)
+
+        SqlLoaderWriter.register_handler("<class 'str'>", lambda value, file: file.write(value))
+        SqlLoaderWriter.register_handler("<class 'int'>", lambda value, file: file.write(str(value)))
+        SqlLoaderWriter.register_handler("<class 'NoneType'>", lambda value, file: file.write('\\N'))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def tearDown(self) -> None:
+        SqlLoaderWriter.handlers.clear()
+        SqlLoaderWriter.handlers.update(self._handlers)
+        self._directory.cleanup()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def _writer(self) -> TestWriter:
+        """
+        Returns a writer for testing.
+        """
+        writer = TestWriter(os.path.join(self._directory.name, 'rows.csv'))
+        writer.fields = ['name', 'number']
+
+        return writer
+
+    # ------------------------------------------------------------------------------------------------------------------
+    @staticmethod
+    def _read(writer: TestWriter) -> str:
+        """
+        Returns the content of the destination file of a writer.
+
+        :param writer: The writer.
+        """
+        with open(writer.filename) as file:
+            return file.read()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_writerows(self) -> None:
+        """
+        Test writerows writes the same data as writerow with a single write per block.
+        """
+        rows = [{'name': 'row {0:d}'.format(i), 'number': i if i % 3 else None} for i in range(100)]
+
+        writer = self._writer()
+        with writer:
+            for row in rows:
+                writer.writerow(row)
+        expected = self._read(writer)
+        self.assertEqual(400, writer.writes)
+
+        writer = self._writer()
+        with writer:
+            writer.writerows(rows)
+        self.assertEqual(expected, self._read(writer))
+        self.assertEqual(1, writer.writes)
+
+        writer = self._writer()
+        writer.buffer_size = 100
+        with writer:
+            writer.writerows(rows[:50])
+            writer.writerows(rows[50:])
+        self.assertEqual(expected, self._read(writer))
+        self.assertGreaterEqual(writer.writes, len(expected) // 110)
+        self.assertLessEqual(writer.writes, len(expected) // 100 + 2)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_writerows_no_handler(self) -> None:
+        """
+        Test writerows writes all rows preceding a row with a value without handler.
+        """
+        writer = self._writer()
+        with writer:
+            with self.assertRaises(ValueError):
+                writer.writerows([{'name': 'row 0', 'number': 0}, {'name': 'row 1', 'number': datetime.date.today()}])
+            writer.writerow({'name': 'row 2', 'number': 2})
+
+        self.assertEqual('row 0\t0\nrow 2\t2\n', self._read(writer))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_handlers(self) -> None:
+        """
+        Test handlers are resolved by class or class name along the MRO and are cached.
+        """
+        writer = self._writer()
+        writer.fields = ['name', 'date']
+        with writer:
+            with self.assertRaises(ValueError):
+                writer.writerows([{'name': 'row 0', 'date': datetime.datetime(2024, 3, 1, 12, 30)}])
+            self.assertIsNone(writer._handler_cache[datetime.datetime])
+
+            SqlLoaderWriter.register_handler(datetime.date, lambda value, file: file.write(value.strftime('%Y%m%d')))
+            self.assertEqual({}, writer._handler_cache)
+            writer.writerow({'name': 'row 1', 'date': datetime.datetime(2024, 3, 1, 12, 30)})
+            writer.writerow({'name': 'row 2', 'date': datetime.date(2024, 3, 2)})
+
+            SqlLoaderWriter.register_handler("<class 'datetime.datetime'>",
+                                             lambda value, file: file.write(value.isoformat()))
+            writer.writerow({'name': 'row 3', 'date': datetime.datetime(2024, 3, 3, 12, 30)})
+
+            self.assertEqual([str, datetime.datetime], list(writer._handler_cache))
+
+        self.assertEqual('row 1\t20240301\nrow 2\t20240302\nrow 3\t2024-03-03T12:30:00\n', self._read(writer))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    def test_serializer(self) -> None:
+        """
+        Test the row serializer is compiled after learning the classes of the values and is compiled again for values
+        of other classes.
+        """
+        rows = [{'name': 'row {0:d}'.format(i), 'number': i if i % 3 else None} for i in range(20)]
+        rows[15]['number'] = 'fifteen'
+
+        writer = self._writer()
+        with writer:
+            writer.writerows(rows)
+        expected = self._read(writer)
+
+        writer = SerializingTestWriter(os.path.join(self._directory.name, 'serialized.csv'))
+        writer.fields = ['name', 'number']
+        writer.learn_rows = 5
+        with writer:
+            writer.writerows(rows[:4])
+            self.assertIsNone(writer._serializer)
+
+            writer.writerows(rows[4:15])
+            serializer = writer._serializer
+            self.assertIsNotNone(serializer)
+            self.assertEqual([[str], [type(None), int]], writer._column_classes)
+
+            writer.writerows(rows[15:])
+            self.assertIsNot(serializer, writer._serializer)
+            self.assertEqual([[str], [type(None), int, str]], writer._column_classes)
+
+            # Registering a handler discards the row serializer, the learned classes are kept.
+            SqlLoaderWriter.register_handler(int, lambda value, file: file.write('#' + str(value)))
+            self.assertIsNone(writer._serializer)
+            writer.writerow({'name': 'row 20', 'number': 20})
+            self.assertIsNotNone(writer._serializer)
+
+        self.assertEqual(expected + 'row 20\t#20\n', self._read(writer))
+        # Only the first 5 rows and the rows with values of other classes are written field by field.
+        self.assertEqual(7, writer._learned_rows)
+
+# ----------------------------------------------------------------------------------------------------------------------